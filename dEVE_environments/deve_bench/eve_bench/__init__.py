@@ -2,3 +2,6 @@ from .archvariety import ArchVariety
 from .basicwirenav import BasicWireNav
 from .dualdevicenav import DualDeviceNav
 from .neurovascular2ins import Neurovascular2Ins
+from .sharedgeometry import SharedGeometry
+from .pathtable import TablePathfinder
+from .centerlineindex import CenterlineIndex
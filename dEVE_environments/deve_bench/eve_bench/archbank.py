@@ -0,0 +1,225 @@
+import os
+import json
+import random
+import shutil
+import argparse
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+import gymnasium as gym
+import eve
+from eve.intervention.vesseltree import ArchType
+from eve.intervention.vesseltree.util.branch import BranchWithRadii
+
+INDEX_NAME = "index.json"
+
+
+def build_arch_bank(
+    bank_dir: str,
+    seeds_vessel: List[int],
+    scaling_xyzd: List[float] = [1.0, 1.0, 1.0, 0.85],
+    rotation_yzx_deg: List[float] = [0.0, 0.0, 0.0],
+    arch_type: ArchType = ArchType.I,
+    overwrite: bool = False,
+) -> None:
+    os.makedirs(bank_dir, exist_ok=True)
+    params = {
+        "scaling_xyzd": list(scaling_xyzd),
+        "rotation_yzx_deg": list(rotation_yzx_deg),
+        "arch_type": str(arch_type),
+    }
+    index = _read_index(bank_dir)
+    if index.get("params", params) != params:
+        raise ValueError(
+            f"{bank_dir} was built with {index['params']}, not with {params}"
+        )
+    index["params"] = params
+    index.setdefault("seeds", [])
+    index.setdefault("coordinate_space", {})
+
+    for seed in seeds_vessel:
+        if seed in index["seeds"] and not overwrite:
+            continue
+        vessel_tree = eve.intervention.vesseltree.AorticArch(
+            arch_type=arch_type,
+            seed=seed,
+            rotation_yzx_deg=rotation_yzx_deg,
+            scaling_xyzd=scaling_xyzd,
+        )
+        vessel_tree.reset()
+
+        shutil.copyfile(vessel_tree.mesh_path, os.path.join(bank_dir, f"{seed}.obj"))
+        branches = {}
+        for branch in vessel_tree.branches:
+            branches[f"{branch.name}_coordinates"] = branch.coordinates
+            branches[f"{branch.name}_radii"] = branch.radii
+        np.savez(
+            os.path.join(bank_dir, f"{seed}.npz"),
+            branch_names=np.array([branch.name for branch in vessel_tree.branches]),
+            insertion_position=vessel_tree.insertion.position,
+            insertion_direction=vessel_tree.insertion.direction,
+            **branches,
+        )
+        if seed not in index["seeds"]:
+            index["seeds"].append(seed)
+        space = vessel_tree.coordinate_space
+        index["coordinate_space"][str(seed)] = [
+            np.asarray(space.low).tolist(),
+            np.asarray(space.high).tolist(),
+        ]
+        # keep the index current, so an interrupted build can be resumed
+        _write_index(bank_dir, index)
+
+
+def _read_index(bank_dir: str) -> dict:
+    index_path = os.path.join(bank_dir, INDEX_NAME)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_index(bank_dir: str, index: dict) -> None:
+    index_path = os.path.join(bank_dir, INDEX_NAME)
+    with open(index_path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(index, file, indent=2)
+    os.replace(index_path + ".tmp", index_path)
+
+
+class ArchBank:
+    def __init__(self, bank_dir: str, cache_size: int = 16) -> None:
+        self.bank_dir = bank_dir
+        self.cache_size = cache_size
+        index = _read_index(bank_dir)
+        if not index.get("seeds"):
+            raise ValueError(f"{bank_dir} contains no arch bank, build it first")
+        self.seeds: List[int] = index["seeds"]
+        self.params: dict = index["params"]
+        self.coordinate_spaces = {
+            int(seed): space for seed, space in index["coordinate_space"].items()
+        }
+        self._cache: OrderedDict = OrderedDict()
+
+    def __getitem__(self, seed: int) -> eve.intervention.vesseltree.FromMesh:
+        if seed in self._cache:
+            self._cache.move_to_end(seed)
+            return self._cache[seed]
+        if seed not in self.seeds:
+            raise KeyError(f"seed {seed} is not in arch bank {self.bank_dir}")
+
+        data = np.load(os.path.join(self.bank_dir, f"{seed}.npz"))
+        branches = [
+            BranchWithRadii(
+                name=str(name),
+                coordinates=data[f"{name}_coordinates"],
+                radii=data[f"{name}_radii"],
+            )
+            for name in data["branch_names"]
+        ]
+        vessel_tree = eve.intervention.vesseltree.FromMesh(
+            os.path.join(self.bank_dir, f"{seed}.obj"),
+            data["insertion_position"],
+            data["insertion_direction"],
+            branch_list=branches,
+            rotation_yzx_deg=[0.0, 0.0, 0.0],
+            scaling_xyz=[1.0, 1.0, 1.0],
+            rotate_branches=False,
+            rotate_ip=False,
+        )
+        self._cache[seed] = vessel_tree
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return vessel_tree
+
+
+class ArchBankRandom(eve.intervention.vesseltree.VesselTree):
+    def __init__(
+        self,
+        bank_dir: str,
+        seeds_vessel: Optional[List[int]] = None,
+        episodes_between_change: int = 1,
+        cache_size: int = 16,
+        seed_random: Optional[int] = None,
+    ) -> None:
+        self.bank_dir = bank_dir
+        self.episodes_between_change = episodes_between_change
+        self.cache_size = cache_size
+        self.seed_random = seed_random
+        self.bank = ArchBank(bank_dir, cache_size)
+        self.seeds_vessel = seeds_vessel or self.bank.seeds
+        missing = set(self.seeds_vessel) - set(self.bank.seeds)
+        if missing:
+            raise ValueError(f"seeds {sorted(missing)} are missing in {bank_dir}")
+        self.seed = None
+        self._rng = random.Random(seed_random)
+        self._vessel_tree = self.bank[self.seeds_vessel[0]]
+
+        # like AorticArchRandom, the coordinate space covers all possible arches
+        spaces = [self.bank.coordinate_spaces[seed] for seed in self.seeds_vessel]
+        self._coordinate_space = gym.spaces.Box(
+            low=np.min([low for low, _ in spaces], axis=0).astype(np.float32),
+            high=np.max([high for _, high in spaces], axis=0).astype(np.float32),
+        )
+
+    def reset(self, episode_nr: int = 0, seed: Optional[int] = None) -> None:
+        if seed is not None:
+            self._rng = random.Random(seed)
+        if self.seed is None or episode_nr % self.episodes_between_change == 0:
+            self.seed = self._rng.choice(self.seeds_vessel)
+            self._vessel_tree = self.bank[self.seed]
+        self._vessel_tree.reset(episode_nr, seed)
+
+    def step(self) -> None:
+        self._vessel_tree.step()
+
+    @property
+    def branches(self):
+        return self._vessel_tree.branches
+
+    @property
+    def insertion(self):
+        return self._vessel_tree.insertion
+
+    @property
+    def branching_points(self):
+        return self._vessel_tree.branching_points
+
+    @property
+    def centerline_coordinates(self):
+        return self._vessel_tree.centerline_coordinates
+
+    @property
+    def coordinate_space(self) -> gym.spaces.Box:
+        return self._coordinate_space
+
+    @property
+    def coordinate_space_episode(self):
+        return self._vessel_tree.coordinate_space_episode
+
+    @property
+    def mesh_path(self) -> str:
+        return self._vessel_tree.mesh_path
+
+    @property
+    def visu_mesh_path(self) -> str:
+        return self._vessel_tree.visu_mesh_path
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._vessel_tree, name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pre-generate an ArchVariety arch bank"
+    )
+    parser.add_argument("bank_dir")
+    parser.add_argument("--seeds", type=int, nargs="+", default=None)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+
+    from .archvariety import SEEDS_VESSEL
+
+    seeds = args.seeds or SEEDS_VESSEL
+    build_arch_bank(args.bank_dir, seeds, overwrite=args.overwrite)
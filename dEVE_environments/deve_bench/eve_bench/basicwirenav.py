@@ -1,5 +1,6 @@
 import math
 import eve
+from .centerlineindex import CenterlineIndex
 
 
 class BasicWireNav(eve.intervention.MonoPlaneStatic):
@@ -67,3 +68,14 @@ class BasicWireNav(eve.intervention.MonoPlaneStatic):
             stop_device_at_tree_end,
             normalize_action,
         )
+        self._centerline_index = None
+
+    @property
+    def centerline_index(self) -> CenterlineIndex:
+        # vmr centerlines are loaded with the vessel tree, the model is static,
+        # so the index is built once on first use
+        if self._centerline_index is None:
+            self._centerline_index = CenterlineIndex.from_branches(
+                self.vessel_tree.branches
+            )
+        return self._centerline_index
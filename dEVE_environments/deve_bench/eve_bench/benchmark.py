@@ -0,0 +1,157 @@
+import sys
+import json
+import platform
+import argparse
+import resource
+import multiprocessing as mp
+from time import perf_counter
+from typing import Dict, List, Optional
+import numpy as np
+
+from . import ArchVariety, BasicWireNav, DualDeviceNav, Neurovascular2Ins
+from .profiling import profile_intervention
+
+INTERVENTIONS = {
+    "ArchVariety": ArchVariety,
+    "BasicWireNav": BasicWireNav,
+    "DualDeviceNav": DualDeviceNav,
+    "Neurovascular2Ins": Neurovascular2Ins,
+}
+
+# metric name -> sign, +1 if higher is better
+METRICS = {
+    "steps_per_sec": 1,
+    "resets_per_sec": 1,
+    "step_latency_p50": -1,
+    "step_latency_p95": -1,
+    "step_latency_p99": -1,
+    "peak_rss_mb": -1,
+}
+
+
+def scripted_action(action_space, step: int) -> np.ndarray:
+    # push forward with 80 % of the velocity limit, alternate rotation every 10 steps
+    rotation = 0.5 if (step // 10) % 2 == 0 else -0.5
+    action = np.array([0.8, rotation], dtype=np.float32)
+    action = np.broadcast_to(action, action_space.shape)
+    return action * action_space.high
+
+
+def run_intervention(
+    name: str, n_episodes: int, n_steps: int, seed: int, profile: bool
+) -> Dict[str, float]:
+    intervention = INTERVENTIONS[name]()
+    profiler = profile_intervention(intervention) if profile else None
+
+    reset_times = []
+    step_times = []
+    for episode in range(n_episodes):
+        start = perf_counter()
+        intervention.reset(episode, seed if episode == 0 else None)
+        reset_times.append(perf_counter() - start)
+        for step in range(n_steps):
+            action = scripted_action(intervention.action_space, step)
+            start = perf_counter()
+            intervention.step(action)
+            step_times.append(perf_counter() - start)
+    intervention.close()
+
+    # ru_maxrss is in kB on linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / 1024**2 if sys.platform == "darwin" else peak_rss / 1024
+
+    result = {
+        "steps_per_sec": len(step_times) / sum(step_times),
+        "resets_per_sec": len(reset_times) / sum(reset_times),
+        "step_latency_p50": float(np.percentile(step_times, 50)),
+        "step_latency_p95": float(np.percentile(step_times, 95)),
+        "step_latency_p99": float(np.percentile(step_times, 99)),
+        "peak_rss_mb": peak_rss_mb,
+    }
+    if profiler is not None:
+        result["phases"] = profiler.summary()
+    return result
+
+
+def run_benchmark(
+    names: List[str],
+    n_episodes: int = 3,
+    n_steps: int = 100,
+    seed: int = 42,
+    profile: bool = False,
+) -> dict:
+    results = {}
+    # fresh process per intervention, so sofa state and peak rss do not leak
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for name in names:
+            results[name] = pool.apply(
+                run_intervention, (name, n_episodes, n_steps, seed, profile)
+            )
+            print(
+                f"{name}: " + ", ".join(f"{k}={results[name][k]:.4g}" for k in METRICS)
+            )
+    return {
+        "meta": {
+            "package": __package__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "n_episodes": n_episodes,
+            "n_steps": n_steps,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        for metric, sign in METRICS.items():
+            old = baseline["results"][name][metric]
+            new = result[metric]
+            change = (new - old) / old if old else 0.0
+            if sign * change < -tolerance:
+                regressions.append(
+                    f"{name}.{metric}: {old:.4g} -> {new:.4g} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Headless throughput benchmark of the bench interventions"
+    )
+    parser.add_argument(
+        "--interventions", nargs="+", default=list(INTERVENTIONS), choices=INTERVENTIONS
+    )
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile", action="store_true", help="add phase timings")
+    parser.add_argument("--output", help="write results as json baseline")
+    parser.add_argument("--compare", help="baseline json to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    current = run_benchmark(
+        args.interventions, args.episodes, args.steps, args.seed, args.profile
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, current, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import hashlib
+from typing import List, Tuple
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def get_tree_fingerprint(branches: List) -> str:
+    tree_hash = hashlib.sha1()
+    for branch in branches:
+        tree_hash.update(branch.name.encode("utf-8"))
+        tree_hash.update(np.ascontiguousarray(branch.coordinates, np.float64).tobytes())
+    return tree_hash.hexdigest()
+
+
+# All centerline points of an anatomy in one kd-tree, with the branch and the
+# arc length along the branch of every point, so projecting a position onto
+# the centerlines is one O(log n) query instead of a scan over all branches.
+class CenterlineIndex:
+    def __init__(
+        self,
+        names: List[str],
+        points: np.ndarray,
+        branch_idx: np.ndarray,
+        arc_length: np.ndarray,
+        fingerprint: str,
+    ) -> None:
+        self.names = list(names)
+        self.points = points
+        self.branch_idx = branch_idx
+        self.arc_length = arc_length
+        self.fingerprint = fingerprint
+        self.offsets = np.searchsorted(branch_idx, np.arange(len(self.names) + 1))
+        self._kd_tree = cKDTree(points)
+
+    @classmethod
+    def from_branches(cls, branches: List) -> "CenterlineIndex":
+        coords = [
+            np.asarray(branch.coordinates, dtype=np.float64) for branch in branches
+        ]
+        n_points = [c.shape[0] for c in coords]
+        arc_length = [
+            np.concatenate(
+                [[0.0], np.cumsum(np.linalg.norm(np.diff(c, axis=0), axis=-1))]
+            )
+            for c in coords
+        ]
+        return cls(
+            [branch.name for branch in branches],
+            np.concatenate(coords),
+            np.repeat(np.arange(len(coords)), n_points),
+            np.concatenate(arc_length),
+            get_tree_fingerprint(branches),
+        )
+
+    def query(
+        self, positions: np.ndarray, k: int = 1, distance_upper_bound: float = np.inf
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        return self._kd_tree.query(
+            positions, k=k, distance_upper_bound=distance_upper_bound
+        )
+
+    def project(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # nearest centerline point index and distance, works on single positions
+        # and on (n, 3) arrays
+        dist, idx = self._kd_tree.query(positions)
+        return idx, dist
+
+    def nearest_branch(self, position: np.ndarray) -> str:
+        idx, _ = self.project(position)
+        return self.names[self.branch_idx[idx]]
+
+    def arc_position(self, position: np.ndarray) -> Tuple[str, float]:
+        idx, _ = self.project(position)
+        return self.names[self.branch_idx[idx]], float(self.arc_length[idx])
+
+    def distance_to_centerline(self, positions: np.ndarray) -> np.ndarray:
+        return self.project(positions)[1]
+
+    def is_branch_end(self, idx: int) -> bool:
+        branch = self.branch_idx[idx]
+        return idx in (self.offsets[branch], self.offsets[branch + 1] - 1)
@@ -0,0 +1,203 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import numpy as np
+from eve.intervention.vesseltree.util.branch import BranchWithRadii
+
+CACHE_VERSION = 1
+CACHE_NAME = ".centerlines_cache"
+
+# Slicer markups are stored in LPS, eve expects (y, -z, -x)
+SLICER_TO_EVE = np.array(
+    [
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, -1.0],
+        [-1.0, 0.0, 0.0],
+    ]
+)
+
+
+def load_points_from_json(
+    json_file_path: str, transform: np.ndarray = SLICER_TO_EVE
+) -> BranchWithRadii:
+    with open(json_file_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    positions = []
+    radii = []
+    for markup in data["markups"]:
+        if markup["type"] == "Curve":
+            positions.extend(point["position"] for point in markup["controlPoints"])
+
+            for measurement in markup.get("measurements", []):
+                if measurement["name"] == "Radius":
+                    radii.extend(measurement["controlPointValues"])
+
+    points = np.array(positions, dtype=np.float64).reshape(-1, 3)
+    points = points @ np.asarray(transform, dtype=np.float64).T
+    points = points.astype(np.float32)
+    filename = os.path.splitext(os.path.basename(json_file_path))[0]
+
+    radii = np.array(radii, dtype=np.float32)
+    branch = BranchWithRadii(name=filename, coordinates=points, radii=radii)
+
+    return branch
+
+
+def find_centerline_files(
+    folder_path: str, names: Optional[List[str]] = None
+) -> List[str]:
+    filenames = sorted(
+        filename
+        for filename in os.listdir(folder_path)
+        if filename.startswith("Centerline curve ") and filename.endswith(".json")
+    )
+    if names is not None:
+        # branch names are the file names without .json
+        filenames = [filename for filename in filenames if filename[:-5] in names]
+        missing = set(names) - {filename[:-5] for filename in filenames}
+        if missing:
+            raise FileNotFoundError(
+                f"centerlines {sorted(missing)} not found in {folder_path}"
+            )
+    return [os.path.join(folder_path, filename) for filename in filenames]
+
+
+class LazyBranchWithRadii(BranchWithRadii):
+    # name is known upfront, everything else is parsed on first access
+    def __init__(  # pylint: disable=super-init-not-called
+        self, json_file_path: str, transform: np.ndarray = SLICER_TO_EVE
+    ) -> None:
+        self.__dict__["name"] = os.path.splitext(os.path.basename(json_file_path))[0]
+        self.__dict__["_json_file_path"] = json_file_path
+        self.__dict__["_transform"] = transform
+
+    @property
+    def loaded(self) -> bool:
+        return "coordinates" in self.__dict__
+
+    def __getattr__(self, name: str):
+        if name.startswith("__") or self.loaded:
+            raise AttributeError(name)
+        branch = load_points_from_json(
+            self.__dict__["_json_file_path"], self.__dict__["_transform"]
+        )
+        self.__dict__.update(branch.__dict__)
+        return getattr(self, name)
+
+
+def load_branches(
+    folder_path: str,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    mmap: bool = True,
+    transform: np.ndarray = SLICER_TO_EVE,
+    n_workers: int = 1,
+    lazy: bool = False,
+    names: Optional[List[str]] = None,
+) -> list:
+    files = find_centerline_files(folder_path, names)
+    if lazy:
+        return [LazyBranchWithRadii(file_path, transform) for file_path in files]
+    if not use_cache:
+        return _load_files(files, transform, n_workers)
+
+    cache_dir = cache_dir or folder_path
+    cache_key = get_cache_key(files, transform)
+    # one cache per selection, so interventions sharing a folder don't evict
+    # each other
+    cache_name = CACHE_NAME
+    if names is not None:
+        cache_name += "." + cache_key[:8]
+    branches = read_cache(cache_dir, cache_key, mmap, cache_name)
+    if branches is None:
+        branches = _load_files(files, transform, n_workers)
+        write_cache(cache_dir, cache_key, branches, cache_name)
+    return branches
+
+
+def _load_files(
+    files: List[str], transform: np.ndarray, n_workers: int
+) -> List[BranchWithRadii]:
+    if n_workers <= 1 or len(files) <= 1:
+        return [load_points_from_json(file_path, transform) for file_path in files]
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        return list(
+            executor.map(lambda path: load_points_from_json(path, transform), files)
+        )
+
+
+def get_cache_key(files: List[str], transform: np.ndarray = SLICER_TO_EVE) -> str:
+    sha = hashlib.sha1(f"v{CACHE_VERSION}".encode())
+    sha.update(np.asarray(transform, dtype=np.float64).tobytes())
+    for file_path in files:
+        sha.update(os.path.basename(file_path).encode())
+        with open(file_path, "rb") as file:
+            sha.update(file.read())
+    return sha.hexdigest()
+
+
+def _cache_paths(cache_dir: str, cache_name: str = CACHE_NAME):
+    base = os.path.join(cache_dir, cache_name)
+    return base + ".npy", base + ".json"
+
+
+def read_cache(
+    cache_dir: str, cache_key: str, mmap: bool = True, cache_name: str = CACHE_NAME
+) -> Optional[List[BranchWithRadii]]:
+    array_path, index_path = _cache_paths(cache_dir, cache_name)
+    try:
+        with open(index_path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+        if index["key"] != cache_key:
+            return None
+        # one (n_points, 4) array with xyz + radius, branches are views into it
+        data = np.load(array_path, mmap_mode="r" if mmap else None)
+    except (OSError, ValueError, KeyError):
+        return None
+    if not index["branches"] or data.shape[0] != index["branches"][-1][2]:
+        return None
+
+    branches = []
+    for name, start, end in index["branches"]:
+        branch = BranchWithRadii(
+            name=name, coordinates=data[start:end, :3], radii=data[start:end, 3]
+        )
+        branches.append(branch)
+    return branches
+
+
+def write_cache(
+    cache_dir: str,
+    cache_key: str,
+    branches: List[BranchWithRadii],
+    cache_name: str = CACHE_NAME,
+) -> None:
+    array_path, index_path = _cache_paths(cache_dir, cache_name)
+    index = {"key": cache_key, "branches": []}
+    start = 0
+    for branch in branches:
+        end = start + branch.coordinates.shape[0]
+        index["branches"].append([branch.name, start, end])
+        start = end
+    data = np.empty((start, 4), dtype=np.float32)
+    for branch, (_, start, end) in zip(branches, index["branches"]):
+        data[start:end, :3] = branch.coordinates
+        data[start:end, 3] = branch.radii
+
+    # write to temporary files and rename, so concurrent workers never see
+    # a half written cache
+    pid = os.getpid()
+    try:
+        with open(f"{array_path}.{pid}.tmp", "wb") as file:
+            np.save(file, data)
+        with open(f"{index_path}.{pid}.tmp", "w", encoding="utf-8") as file:
+            json.dump(index, file)
+        os.replace(f"{array_path}.{pid}.tmp", array_path)
+        os.replace(f"{index_path}.{pid}.tmp", index_path)
+    except OSError:
+        for tmp_path in (f"{array_path}.{pid}.tmp", f"{index_path}.{pid}.tmp"):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
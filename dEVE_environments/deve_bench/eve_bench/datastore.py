@@ -0,0 +1,37 @@
+import os
+
+# One copy of the anatomy data for all interventions and variants. DualDeviceNav
+# and Neurovascular2Ins share the mesh and most centerlines, they differ only
+# in how the carotids and vertebrals are split into branches.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+VESSEL_MESH = os.path.join(DATA_DIR, "vessel_architecture_collision.obj")
+VISU_MESH = os.path.join(DATA_DIR, "vessel_architecture_visual.obj")
+CENTERLINE_FOLDER = os.path.join(DATA_DIR, "Centrelines_comb")
+
+# fmt: off
+SHARED_CENTERLINE_IDS = [
+    0, 2, 3, 4, 5, 6, 7, 9, 10, 11, 13, 14, 15, 17, 18, 19, 21, 22, 23, 24, 31,
+]
+# fmt: on
+SHARED_CENTERLINES = [f"Centerline curve ({i}).mrk" for i in SHARED_CENTERLINE_IDS]
+DUALDEVICENAV_CENTERLINES = SHARED_CENTERLINES + [
+    "Centerline curve - LCCA.mrk",
+    "Centerline curve - LVA.mrk",
+    "Centerline curve - RCCA.mrk",
+    "Centerline curve - RVA.mrk",
+]
+NEUROVASCULAR_CENTERLINES = SHARED_CENTERLINES + [
+    "Centerline curve - LCCA_lower.mrk",
+    "Centerline curve - LCCA_mid1.mrk",
+    "Centerline curve - LCCA_mid2.mrk",
+    "Centerline curve - LCCA_targets.mrk",
+    "Centerline curve - LCCA_upper.mrk",
+    "Centerline curve - LVA_lower.mrk",
+    "Centerline curve - LVA_upper.mrk",
+    "Centerline curve - RCCA_lower.mrk",
+    "Centerline curve - RCCA_mid.mrk",
+    "Centerline curve - RCCA_targets.mrk",
+    "Centerline curve - RCCA_upper.mrk",
+    "Centerline curve - RVA_lower.mrk",
+    "Centerline curve - RVA_upper.mrk",
+]
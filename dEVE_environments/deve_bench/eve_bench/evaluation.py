@@ -0,0 +1,232 @@
+import os
+import csv
+import multiprocessing as mp
+from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
+import cloudpickle
+import numpy as np
+import gymnasium as gym
+import torch
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.policies import BasePolicy
+from stable_baselines3.common.vec_env import SubprocVecEnv, VecEnv
+
+# eval envs of a worker process by pickled factory and number of envs, created
+# on the first evaluation and kept for the next ones, like the single eval env
+# of the trainer before
+_eval_envs: Dict[Tuple[bytes, int], Union[gym.Env, VecEnv]] = {}
+
+
+def run_episodes(policy: BasePolicy, env: gym.Env, n_episodes: int) -> dict:
+    # env is wrapped in NavigationTimer, like the envs of run_vec_episodes
+    success_count = 0
+    total_navigation_time = 0.0
+    path_ratio_unsuccessful = []
+    for _ in range(n_episodes):
+        obs, info = env.reset()
+        done = False
+        while not done:
+            action, _ = policy.predict(obs, deterministic=True)
+            obs, _, terminal, truncation, info = env.step(action)
+            done = terminal or truncation
+            if terminal:
+                success_count += 1
+                total_navigation_time += info["navigation_time"]
+            elif truncation:
+                path_ratio_unsuccessful.append(info.get("path_ratio", 0))
+    return {
+        "n_episodes": n_episodes,
+        "success_count": success_count,
+        "total_navigation_time": total_navigation_time,
+        "path_ratio_unsuccessful": path_ratio_unsuccessful,
+    }
+
+
+class NavigationTimer(gym.Wrapper):
+    # wall time spent in env.step during the episode. Used for every eval
+    # env, so the navigation time does not depend on n_envs: policy
+    # predictions and waiting for the other envs of a batch are not counted.
+    def reset(self, **kwargs):
+        self._navigation_time = 0.0
+        return self.env.reset(**kwargs)
+
+    def step(self, action):
+        start_time = perf_counter()
+        obs, reward, terminal, truncation, info = self.env.step(action)
+        self._navigation_time += perf_counter() - start_time
+        info["navigation_time"] = self._navigation_time
+        return obs, reward, terminal, truncation, info
+
+
+def _make_timed_env(env_factory: Callable[[], gym.Env]) -> gym.Env:
+    return NavigationTimer(env_factory())
+
+
+def run_vec_episodes(policy: BasePolicy, venv: VecEnv, n_episodes: int) -> dict:
+    # one batched predict for all envs per step. envs reset automatically and
+    # start the next episode until n_episodes are started, after that their
+    # results are dropped while the remaining episodes finish
+    n_envs = venv.num_envs
+    success_count = 0
+    total_navigation_time = 0.0
+    path_ratio_unsuccessful = []
+    obs = venv.reset()
+    active = np.arange(n_envs) < n_episodes
+    n_started = int(active.sum())
+    while active.any():
+        actions, _ = policy.predict(obs, deterministic=True)
+        obs, _, dones, infos = venv.step(actions)
+        for i in np.flatnonzero(dones & active):
+            if infos[i].get("TimeLimit.truncated", False):
+                path_ratio_unsuccessful.append(infos[i].get("path_ratio", 0))
+            else:
+                success_count += 1
+                total_navigation_time += infos[i]["navigation_time"]
+            if n_started < n_episodes:
+                n_started += 1
+            else:
+                active[i] = False
+    return {
+        "n_episodes": n_episodes,
+        "success_count": success_count,
+        "total_navigation_time": total_navigation_time,
+        "path_ratio_unsuccessful": path_ratio_unsuccessful,
+    }
+
+
+def _init_worker() -> None:
+    # keep the cores for the training env workers
+    torch.set_num_threads(1)
+
+
+def evaluate_snapshot(
+    env_factory: bytes,
+    policy_class: Type[BasePolicy],
+    policy_path: str,
+    n_episodes: int,
+    n_envs: int = 1,
+) -> dict:
+    key = (env_factory, n_envs)
+    if key not in _eval_envs:
+        factory = cloudpickle.loads(env_factory)
+        if n_envs == 1:
+            _eval_envs[key] = _make_timed_env(factory)
+        else:
+            venv = SubprocVecEnv([partial(_make_timed_env, factory)] * n_envs)
+            # distinct random seeds, otherwise all envs play the same episodes
+            venv.seed()
+            _eval_envs[key] = venv
+    policy = policy_class.load(policy_path, device="cpu")
+    policy.set_training_mode(False)
+    if n_envs == 1:
+        return run_episodes(policy, _eval_envs[key], n_episodes)
+    return run_vec_episodes(policy, _eval_envs[key], n_episodes)
+
+
+class AsyncEvalCallback(BaseCallback):
+    # At every eval step the trainer only saves a snapshot of the policy, the
+    # episodes run in separate processes. Rows are appended to the csv in
+    # timestep order once their evaluation finished, call close() at the end
+    # of training to wait for the pending ones. With n_envs > 1 every worker
+    # runs the episodes of an evaluation in n_envs env processes at once.
+    def __init__(
+        self,
+        env_factory: Callable[[], gym.Env],
+        eval_freq: int,
+        log_path: str,
+        start_step: int = 0,
+        n_episodes: int = 100,
+        n_workers: int = 1,
+        n_envs: int = 1,
+        snapshot_dir: Optional[str] = None,
+        verbose: int = 1,
+    ):
+        super().__init__(verbose)
+        self.env_factory = env_factory
+        self.eval_freq = eval_freq
+        self.log_path = log_path
+        self.next_eval_step = start_step + eval_freq
+        self.num_episodes = n_episodes
+        self.n_workers = n_workers
+        self.n_envs = n_envs
+        self.snapshot_dir = snapshot_dir or os.path.splitext(log_path)[0] + "_snapshots"
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._env_factory_pickle: Optional[bytes] = None
+        self._pending: List[Tuple[int, str, Future]] = []
+
+    def _start_executor(self) -> None:
+        self._env_factory_pickle = cloudpickle.dumps(self.env_factory)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps >= self.next_eval_step:
+            self.submit_evaluation()
+            self.next_eval_step += self.eval_freq
+        self.write_finished()
+        return True
+
+    def submit_evaluation(self) -> None:
+        if self._executor is None:
+            self._start_executor()
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        policy_path = os.path.join(
+            self.snapshot_dir, f"policy_{self.num_timesteps}.pth"
+        )
+        self.model.policy.save(policy_path)
+        future = self._executor.submit(
+            evaluate_snapshot,
+            self._env_factory_pickle,
+            type(self.model.policy),
+            policy_path,
+            self.num_episodes,
+            self.n_envs,
+        )
+        self._pending.append((self.num_timesteps, policy_path, future))
+
+    def write_finished(self, wait: bool = False) -> None:
+        while self._pending and (wait or self._pending[0][2].done()):
+            timesteps, policy_path, future = self._pending.pop(0)
+            results = future.result()
+            os.remove(policy_path)
+            self.log_results(timesteps, results)
+
+    def log_results(self, timesteps: int, results: dict) -> None:
+        success_count = results["success_count"]
+        success_rate = success_count / results["n_episodes"]
+        mean_navigation_time = (
+            results["total_navigation_time"] / success_count if success_count > 0 else 0
+        )
+        path_ratio_unsuccessful = results["path_ratio_unsuccessful"]
+        mean_path_ratio = (
+            np.mean(path_ratio_unsuccessful) if path_ratio_unsuccessful else 0
+        )
+
+        with open(self.log_path, "a", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(
+                [
+                    timesteps,
+                    f"{success_rate:.2f}",
+                    f"{mean_navigation_time:.2f}",
+                    f"{mean_path_ratio:.8f}",
+                ]
+            )
+
+        if self.verbose > 0:
+            print(f"Evaluated at {timesteps} steps:")
+            print(f" Success Rate: {success_rate * 100:.2f}%")
+            print(f" Mean Navigation Time: {mean_navigation_time:.2f} seconds")
+
+    def close(self) -> None:
+        self.write_finished(wait=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if os.path.isdir(self.snapshot_dir) and not os.listdir(self.snapshot_dir):
+            os.rmdir(self.snapshot_dir)
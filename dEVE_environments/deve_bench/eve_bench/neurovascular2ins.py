@@ -1,24 +1,25 @@
-import os
-import json
-import numpy as np
-from typing import Tuple, List
+from typing import Optional
 import eve
-from eve.intervention.vesseltree.util.branch import (
-    Branch,
-    BranchWithRadii,
-)
+from .centerlines import load_branches
+from .centerlineindex import CenterlineIndex
+from .sharedgeometry import SharedGeometry
+from .datastore import VESSEL_MESH, CENTERLINE_FOLDER, NEUROVASCULAR_CENTERLINES
+
 
 class Neurovascular2Ins(eve.intervention.MonoPlaneStatic):
     def __init__(
         self,
         stop_device_at_tree_end: bool = True,
         normalize_action: bool = False,
+        geometry: Optional[SharedGeometry] = None,
+        friction: float = 0.1,
     ) -> None:
-        folder = os.path.dirname(os.path.abspath(__file__))
-        mesh = os.path.join(folder, "mesh_full", "vessel_architecture_collision.obj")
-
-        centerline_folder_path = os.path.join(folder, "mesh_full", "Centrelines_comb")
-        branches = load_branches(centerline_folder_path)
+        if geometry is None:
+            mesh = VESSEL_MESH
+            branches = load_branches(CENTERLINE_FOLDER, names=NEUROVASCULAR_CENTERLINES)
+        else:
+            mesh = geometry.mesh_path
+            branches = geometry.branches
 
         insertion = [65.0, -5.0, 35.0]
 
@@ -32,7 +33,7 @@ class Neurovascular2Ins(eve.intervention.MonoPlaneStatic):
             rotate_branches=False,
             rotate_ip=False,
         )
-        
+
         device1 = eve.intervention.device.JShaped(
             name="mic_guide",
             length=900,
@@ -66,7 +67,7 @@ class Neurovascular2Ins(eve.intervention.MonoPlaneStatic):
             beams_per_mm_straight=0.6,
         )
 
-        simulation = eve.intervention.simulation.SofaBeamAdapter(friction=0.1)
+        simulation = eve.intervention.simulation.SofaBeamAdapter(friction=friction)
 
         fluoroscopy = eve.intervention.fluoroscopy.TrackingOnly(
             simulation=simulation,
@@ -94,44 +95,9 @@ class Neurovascular2Ins(eve.intervention.MonoPlaneStatic):
             stop_device_at_tree_end,
             normalize_action,
         )
+        # the anatomy is static, so the projection index is built only once
+        self.centerline_index = CenterlineIndex.from_branches(branches)
 
-
-def load_points_from_json(json_file_path: str) -> Tuple[Branch, List[float]]:
-    with open(json_file_path, "r", encoding="utf-8") as file:
-        data = json.load(file)
-
-    points = []
-    radii = []
-    for markup in data["markups"]:
-        if markup["type"] == "Curve":
-            control_points = markup["controlPoints"]
-            for point in control_points:
-                position = point["position"]
-                x = float(position[0])
-                y = float(position[1])
-                z = float(position[2])
-                points.append((y, -z, -x))  # Append as a tuple instead of a list
-
-            if "measurements" in markup:
-                measurements = markup["measurements"]
-                for measurement in measurements:
-                    if measurement["name"] == "Radius":
-                        radii.extend(measurement["controlPointValues"])
-
-    points = np.array(points, dtype=np.float32)
-    filename = os.path.splitext(os.path.basename(json_file_path))[0]
-
-    radii = np.array(radii, dtype=np.float32)
-    branch = BranchWithRadii(name=filename, coordinates=points, radii=radii)
-
-    return branch
-
-
-def load_branches(folder_path: str) -> list:
-    centerlines = []
-    for filename in os.listdir(folder_path):
-        if filename.startswith("Centerline curve ") and filename.endswith(".json"):
-            file_path = os.path.join(folder_path, filename)
-            centerline = load_points_from_json(file_path)
-            centerlines.append(centerline)
-    return centerlines
+    @staticmethod
+    def shared_geometry() -> SharedGeometry:
+        return SharedGeometry(VESSEL_MESH, CENTERLINE_FOLDER, NEUROVASCULAR_CENTERLINES)
@@ -0,0 +1,262 @@
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import shortest_path
+import eve
+from .centerlineindex import CenterlineIndex, get_tree_fingerprint
+
+JUNCTION_TOLERANCE = 2.0
+
+
+def _drop_repeated(points: np.ndarray) -> np.ndarray:
+    # branches meeting at a junction each have a point at its coordinates
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+    return points[keep]
+
+
+class CenterlinePathTable:
+    # shortest path lengths along the centerlines. nodes are the branch ends and
+    # the points where other branches join, all node pairs are precomputed, so a
+    # query is a kd-tree projection plus a few lookups
+    def __init__(
+        self,
+        index: CenterlineIndex,
+        node_point: np.ndarray,
+        segment_nodes: np.ndarray,
+        node_dist: np.ndarray,
+        node_pred: np.ndarray,
+    ) -> None:
+        self.index = index
+        self.node_point = node_point
+        self.segment_nodes = segment_nodes
+        self.node_dist = node_dist
+        self.node_pred = node_pred
+
+    @classmethod
+    def from_index(
+        cls, index: CenterlineIndex, junction_tolerance: float = JUNCTION_TOLERANCE
+    ) -> "CenterlinePathTable":
+        points = index.points
+        branch_idx = index.branch_idx
+        arc_length = index.arc_length
+        offsets = index.offsets
+        n_branches = len(index.names)
+
+        # branch ends join the nearest point of another branch within tolerance
+        node_points = {int(offsets[b]) for b in range(n_branches)}
+        node_points |= {int(offsets[b + 1] - 1) for b in range(n_branches)}
+        junctions = []
+        for end in sorted(node_points):
+            dists, idxs = index.query(
+                points[end],
+                k=min(32, points.shape[0]),
+                distance_upper_bound=junction_tolerance,
+            )
+            for dist, idx in zip(np.atleast_1d(dists), np.atleast_1d(idxs)):
+                if not np.isfinite(dist):
+                    break
+                if branch_idx[idx] != branch_idx[end]:
+                    junctions.append((end, int(idx), float(dist)))
+                    break
+        node_points |= {idx for _, idx, _ in junctions}
+        node_point = np.array(sorted(node_points))
+        node_of_point = {point: node for node, point in enumerate(node_point)}
+
+        # edges between neighbouring nodes on a branch and across junctions
+        rows, cols, weights = [], [], []
+        segment_nodes = np.empty((points.shape[0], 2), dtype=np.int64)
+        for b in range(n_branches):
+            branch_nodes = node_point[
+                (node_point >= offsets[b]) & (node_point < offsets[b + 1])
+            ]
+            for low, high in zip(branch_nodes[:-1], branch_nodes[1:]):
+                rows.append(node_of_point[low])
+                cols.append(node_of_point[high])
+                weights.append(arc_length[high] - arc_length[low])
+                segment_nodes[low : high + 1] = [
+                    node_of_point[low],
+                    node_of_point[high],
+                ]
+        for end, idx, dist in junctions:
+            rows.append(node_of_point[end])
+            cols.append(node_of_point[idx])
+            weights.append(max(dist, 1e-9))
+        n_nodes = node_point.shape[0]
+        graph = coo_matrix((weights, (rows, cols)), shape=(n_nodes, n_nodes)).tocsr()
+        node_dist, node_pred = shortest_path(
+            graph, directed=False, return_predecessors=True
+        )
+        return cls(index, node_point, segment_nodes, node_dist, node_pred)
+
+    @classmethod
+    def from_branches(
+        cls, branches: List, junction_tolerance: float = JUNCTION_TOLERANCE
+    ) -> "CenterlinePathTable":
+        return cls.from_index(
+            CenterlineIndex.from_branches(branches), junction_tolerance
+        )
+
+    def project(self, position: np.ndarray) -> int:
+        return int(self.index.project(position)[0])
+
+    def _best_route(
+        self, start: int, end: int
+    ) -> Tuple[float, Optional[int], Optional[int]]:
+        # length and first / last node of the shortest route between two points,
+        # nodes are None if both points are on the same segment
+        branch_idx = self.index.branch_idx
+        arc_length = self.index.arc_length
+        best = (np.inf, None, None)
+        if branch_idx[start] == branch_idx[end] and np.array_equal(
+            self.segment_nodes[start], self.segment_nodes[end]
+        ):
+            best = (abs(arc_length[start] - arc_length[end]), None, None)
+        for start_node in self.segment_nodes[start]:
+            to_start_node = abs(
+                arc_length[start] - arc_length[self.node_point[start_node]]
+            )
+            for end_node in self.segment_nodes[end]:
+                from_end_node = abs(
+                    arc_length[end] - arc_length[self.node_point[end_node]]
+                )
+                length = (
+                    to_start_node + self.node_dist[start_node, end_node] + from_end_node
+                )
+                if length < best[0]:
+                    best = (length, int(start_node), int(end_node))
+        return best
+
+    def path_length(self, start: int, end: int) -> float:
+        return float(self._best_route(start, end)[0])
+
+    def _branch_slice(self, start: int, end: int) -> np.ndarray:
+        step = 1 if end >= start else -1
+        return self.index.points[start : end + step if end + step >= 0 else None : step]
+
+    def path(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        # centerline points and traversed node points of the shortest route
+        _, start_node, end_node = self._best_route(start, end)
+        if start_node is None:
+            return self._branch_slice(start, end), np.empty((0, 3))
+        nodes = [end_node]
+        while nodes[-1] != start_node:
+            nodes.append(int(self.node_pred[start_node, nodes[-1]]))
+        point_idxs = (
+            [start] + [int(self.node_point[n]) for n in reversed(nodes)] + [end]
+        )
+        pieces = [self.index.points[[start]]]
+        for low, high in zip(point_idxs[:-1], point_idxs[1:]):
+            if self.index.branch_idx[low] == self.index.branch_idx[high]:
+                piece = self._branch_slice(low, high)
+            else:
+                piece = self.index.points[[low, high]]
+            # the first point is the last point of the previous piece
+            pieces.append(piece[1:])
+        return (
+            _drop_repeated(np.concatenate(pieces)),
+            _drop_repeated(self.index.points[point_idxs[1:-1]]),
+        )
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            names=np.array(self.index.names),
+            points=self.index.points,
+            branch_idx=self.index.branch_idx,
+            arc_length=self.index.arc_length,
+            fingerprint=np.array(self.index.fingerprint),
+            node_point=self.node_point,
+            segment_nodes=self.segment_nodes,
+            node_dist=self.node_dist,
+            node_pred=self.node_pred,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CenterlinePathTable":
+        with np.load(path) as data:
+            index = CenterlineIndex(
+                data["names"].tolist(),
+                data["points"],
+                data["branch_idx"],
+                data["arc_length"],
+                str(data["fingerprint"]),
+            )
+            return cls(
+                index,
+                data["node_point"],
+                data["segment_nodes"],
+                data["node_dist"],
+                data["node_pred"],
+            )
+
+
+class TablePathfinder(eve.pathfinder.Pathfinder):
+    # drop-in for BruteForceBFS, the path graph is only rebuilt when the vessel
+    # tree changes and a step is a table lookup instead of a graph search
+    def __init__(
+        self,
+        intervention: eve.intervention.Intervention,
+        table_dir: Optional[str] = None,
+        cache_size: int = 8,
+        junction_tolerance: float = JUNCTION_TOLERANCE,
+    ) -> None:
+        self.intervention = intervention
+        self.table_dir = table_dir
+        self.cache_size = cache_size
+        self.junction_tolerance = junction_tolerance
+        self.path_length = 0.0
+        self.path_points3d = np.empty((0, 3))
+        self.path_branching_points3d = np.empty((0, 3))
+        self._tables = OrderedDict()
+        self._table = None
+
+    def _get_table(self) -> CenterlinePathTable:
+        branches = self.intervention.vessel_tree.branches
+        fingerprint = get_tree_fingerprint(branches)
+        if fingerprint in self._tables:
+            self._tables.move_to_end(fingerprint)
+            return self._tables[fingerprint]
+
+        table_path = None
+        if self.table_dir is not None:
+            table_path = os.path.join(self.table_dir, f"{fingerprint}.npz")
+        if table_path is not None and os.path.exists(table_path):
+            table = CenterlinePathTable.load(table_path)
+        else:
+            # static interventions already built the kd-tree of their centerlines
+            index = getattr(self.intervention, "centerline_index", None)
+            if index is None or index.fingerprint != fingerprint:
+                index = CenterlineIndex.from_branches(branches)
+            table = CenterlinePathTable.from_index(index, self.junction_tolerance)
+            if table_path is not None:
+                os.makedirs(self.table_dir, exist_ok=True)
+                table.save(table_path)
+
+        self._tables[fingerprint] = table
+        if len(self._tables) > self.cache_size:
+            self._tables.popitem(last=False)
+        return table
+
+    def step(self) -> None:
+        fluoroscopy = self.intervention.fluoroscopy
+        tip = fluoroscopy.tracking3d_to_vessel_cs(fluoroscopy.tracking3d[0])
+        target = self.intervention.target.coordinates_vessel_cs
+        start_idx = self._table.project(tip)
+        end_idx = self._table.project(target)
+        path_points, branching_points = self._table.path(start_idx, end_idx)
+        self.path_length = self._table.path_length(start_idx, end_idx)
+        # the table is in vessel cs, the points are given in the tracking frame
+        # like the tip position they are computed from
+        self.path_points3d = fluoroscopy.vessel_cs_to_tracking3d(path_points)
+        self.path_branching_points3d = fluoroscopy.vessel_cs_to_tracking3d(
+            branching_points
+        )
+
+    def reset(self, episode_nr: int = 0) -> None:
+        self._table = self._get_table()
+        self.step()
@@ -0,0 +1,120 @@
+import csv
+import json
+import functools
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, List, Optional
+import numpy as np
+import eve
+
+FIELDS = ["event", "episode", "step", "phase", "wall_time", "alloc_bytes"]
+COMPONENTS = ["vessel_tree", "simulation", "fluoroscopy", "target"]
+
+
+class PhaseProfiler:
+    def __init__(self, maxlen: int = 10000, trace_allocations: bool = False) -> None:
+        self.maxlen = maxlen
+        self.trace_allocations = trace_allocations
+        self.records = deque(maxlen=maxlen)
+        self.episode = -1
+        self.step = 0
+        self._event = None
+
+    @contextmanager
+    def phase(self, name: str):
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        alloc_start = (
+            tracemalloc.get_traced_memory()[0] if self.trace_allocations else 0
+        )
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = perf_counter() - start
+            alloc = (
+                tracemalloc.get_traced_memory()[0] - alloc_start
+                if self.trace_allocations
+                else 0
+            )
+            self.records.append(
+                {
+                    "event": self._event,
+                    "episode": self.episode,
+                    "step": self.step,
+                    "phase": name,
+                    "wall_time": wall_time,
+                    "alloc_bytes": alloc,
+                }
+            )
+
+    def wrap(self, obj, method_name: str, phase_name: str, event: Optional[str] = None):
+        method = getattr(obj, method_name)
+
+        @functools.wraps(method)
+        def wrapped(*args, **kwargs):
+            if event is not None:
+                self._event = event
+                if event == "reset":
+                    self.episode += 1
+                    self.step = 0
+            with self.phase(phase_name):
+                result = method(*args, **kwargs)
+            if event == "step":
+                self.step += 1
+            return result
+
+        setattr(obj, method_name, wrapped)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        wall_times: Dict[str, List[float]] = {}
+        for record in self.records:
+            wall_times.setdefault(record["phase"], []).append(record["wall_time"])
+        return {
+            phase: {
+                "count": len(times),
+                "total": float(np.sum(times)),
+                "mean": float(np.mean(times)),
+                "p95": float(np.percentile(times, 95)),
+                "max": float(np.max(times)),
+            }
+            for phase, times in wall_times.items()
+        }
+
+    def to_csv(self, path: str) -> None:
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"summary": self.summary(), "records": list(self.records)},
+                file,
+                indent=2,
+            )
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+def profile_intervention(
+    intervention: eve.intervention.MonoPlaneStatic,
+    profiler: Optional[PhaseProfiler] = None,
+    trace_allocations: bool = False,
+) -> PhaseProfiler:
+    profiler = profiler or PhaseProfiler(trace_allocations=trace_allocations)
+    # components first, so their timings end up nested in reset and step
+    for component_name in COMPONENTS:
+        component = getattr(intervention, component_name, None)
+        if component is None:
+            continue
+        for method_name in ("reset", "step"):
+            if hasattr(component, method_name):
+                profiler.wrap(component, method_name, f"{method_name}.{component_name}")
+    profiler.wrap(intervention, "reset", "reset", event="reset")
+    profiler.wrap(intervention, "step", "step", event="step")
+    return profiler
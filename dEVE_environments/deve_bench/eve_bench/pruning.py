@@ -0,0 +1,119 @@
+import os
+import csv
+from typing import Dict, List, Optional, Set, Tuple, Union
+import numpy as np
+
+# (timestep, success rate) per evaluation, in timestep order
+EvalResults = List[Tuple[int, float]]
+
+
+def read_eval_results(log_path: str) -> EvalResults:
+    # rows as written by AsyncEvalCallback.log_results:
+    # timestep, success rate, navigation time, path ratio
+    if not os.path.exists(log_path):
+        return []
+    results = []
+    with open(log_path, "r", newline="", encoding="utf-8") as file:
+        for row in csv.reader(file):
+            try:
+                results.append((int(row[0]), float(row[1])))
+            except (IndexError, ValueError):
+                # the row currently being written
+                continue
+    return results
+
+
+def _index_at(results: EvalResults, timestep: int) -> Optional[int]:
+    # first evaluation at or after timestep. Evaluations start when a run
+    # passed the eval step, so runs are compared by simulation steps, not by
+    # wall time or evaluation count.
+    for i, (eval_timestep, _) in enumerate(results):
+        if eval_timestep >= timestep:
+            return i
+    return None
+
+
+class MedianStoppingRule:
+    # Stops a run if its best success rate is below the median of the other
+    # runs' mean success rates up to the same timestep.
+    def __init__(self, grace_steps: int = 0, min_runs: int = 3) -> None:
+        self.grace_steps = grace_steps
+        self.min_runs = min_runs
+
+    def should_stop(self, name: str, results: Dict[str, EvalResults]) -> bool:
+        own = results[name]
+        if not own or own[-1][0] < self.grace_steps:
+            return False
+        timestep = own[-1][0]
+        best = max(rate for _, rate in own)
+        others = []
+        for other, other_results in results.items():
+            if other == name:
+                continue
+            index = _index_at(other_results, timestep)
+            if index is not None:
+                others.append(np.mean([rate for _, rate in other_results[: index + 1]]))
+        if len(others) < self.min_runs:
+            return False
+        return best < np.median(others)
+
+
+class SuccessiveHalving:
+    # Asynchronous successive halving. Rungs are at min_steps *
+    # reduction_factor**k simulation steps. At each rung a run continues only if
+    # its success rate is in the top 1 / reduction_factor of the runs that
+    # reached the rung. Every run is decided once per rung, as soon as
+    # min_runs runs reached it.
+    def __init__(
+        self, min_steps: int, reduction_factor: int = 3, min_runs: int = 3
+    ) -> None:
+        self.min_steps = min_steps
+        self.reduction_factor = reduction_factor
+        self.min_runs = min_runs
+        self._promoted: Set[Tuple[str, int]] = set()
+
+    def rungs(self, timestep: int) -> List[int]:
+        rungs = []
+        rung = self.min_steps
+        while rung <= timestep:
+            rungs.append(rung)
+            rung *= self.reduction_factor
+        return rungs
+
+    def should_stop(self, name: str, results: Dict[str, EvalResults]) -> bool:
+        own = results[name]
+        if not own:
+            return False
+        for rung in self.rungs(own[-1][0]):
+            if (name, rung) in self._promoted:
+                continue
+            competing = []
+            for other_results in results.values():
+                index = _index_at(other_results, rung)
+                if index is not None:
+                    competing.append(other_results[index][1])
+            if len(competing) < self.min_runs:
+                return False
+            n_promoted = max(1, len(competing) // self.reduction_factor)
+            threshold = sorted(competing, reverse=True)[n_promoted - 1]
+            if own[_index_at(own, rung)][1] < threshold:
+                return True
+            self._promoted.add((name, rung))
+        return False
+
+
+PRUNERS = {
+    "median": MedianStoppingRule,
+    "successive_halving": SuccessiveHalving,
+}
+
+
+Pruner = Union[MedianStoppingRule, SuccessiveHalving]
+
+
+def make_pruner(config: dict) -> Pruner:
+    kwargs = dict(config)
+    rule = kwargs.pop("rule")
+    if rule not in PRUNERS:
+        raise ValueError(f"pruning rule {rule!r} not in {sorted(PRUNERS)}")
+    return PRUNERS[rule](**kwargs)
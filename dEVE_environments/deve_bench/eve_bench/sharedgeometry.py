@@ -0,0 +1,131 @@
+import weakref
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from eve.intervention.vesseltree.util.branch import BranchWithRadii
+
+from .centerlines import load_branches
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # python < 3.13 registers attached segments with the resource tracker,
+    # which would unlink them when the first worker exits
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _release(shms: Dict[str, shared_memory.SharedMemory], unlink: bool) -> None:
+    for shm in shms.values():
+        try:
+            shm.close()
+        except BufferError:
+            # branches handed out still reference the buffer
+            pass
+        if unlink:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# Create in the parent process and pass it to the env factories. Pickling only
+# transfers the shared memory names, workers attach read-only numpy views of
+# the centerlines. The mesh itself is loaded by the vessel tree from
+# mesh_path, as it takes a file and not vertex arrays.
+class SharedGeometry:
+    def __init__(
+        self,
+        mesh_path: str,
+        centerline_folder: Optional[str] = None,
+        centerline_names: Optional[List[str]] = None,
+    ):
+        self.mesh_path = mesh_path
+        self.centerline_folder = centerline_folder
+        self.centerline_names = centerline_names
+        self._shms: Dict[str, shared_memory.SharedMemory] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._branch_index: List[Tuple[str, int, int]] = []
+        # unlinks the segments also if close() is never called
+        self._finalizer = weakref.finalize(self, _release, self._shms, True)
+
+        if centerline_folder is not None:
+            branches = load_branches(
+                centerline_folder, mmap=False, names=centerline_names
+            )
+            start = 0
+            for branch in branches:
+                end = start + branch.coordinates.shape[0]
+                self._branch_index.append((branch.name, start, end))
+                start = end
+            centerlines = np.empty((start, 4), dtype=np.float32)
+            for branch, (_, start, end) in zip(branches, self._branch_index):
+                centerlines[start:end, :3] = branch.coordinates
+                centerlines[start:end, 3] = branch.radii
+            self._share("centerlines", centerlines)
+
+    @property
+    def branches(self) -> List[BranchWithRadii]:
+        if "centerlines" not in self._arrays:
+            return []
+        centerlines = self._arrays["centerlines"]
+        return [
+            BranchWithRadii(
+                name=name,
+                coordinates=centerlines[start:end, :3],
+                radii=centerlines[start:end, 3],
+            )
+            for name, start, end in self._branch_index
+        ]
+
+    def _share(self, key: str, array: np.ndarray) -> None:
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared[:] = array
+        shared.flags.writeable = False
+        self._shms[key] = shm
+        self._arrays[key] = shared
+
+    def __getstate__(self):
+        return {
+            "mesh_path": self.mesh_path,
+            "centerline_folder": self.centerline_folder,
+            "centerline_names": self.centerline_names,
+            "branch_index": self._branch_index,
+            "arrays": {
+                key: (self._shms[key].name, array.shape, array.dtype.str)
+                for key, array in self._arrays.items()
+            },
+        }
+
+    def __setstate__(self, state):
+        self.mesh_path = state["mesh_path"]
+        self.centerline_folder = state["centerline_folder"]
+        self.centerline_names = state["centerline_names"]
+        self._shms = {}
+        self._arrays = {}
+        self._branch_index = [tuple(entry) for entry in state["branch_index"]]
+        for key, (name, shape, dtype) in state["arrays"].items():
+            shm = _attach(name)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            array.flags.writeable = False
+            self._shms[key] = shm
+            self._arrays[key] = array
+        self._finalizer = weakref.finalize(self, _release, self._shms, False)
+
+    def close(self) -> None:
+        self._arrays = {}
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
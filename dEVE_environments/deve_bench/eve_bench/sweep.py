@@ -0,0 +1,393 @@
+import os
+import re
+import sys
+import csv
+import time
+import signal
+import argparse
+import itertools
+import subprocess
+from typing import Dict, List, Optional, Tuple
+import yaml
+
+from .training import ConfigLoader, find_latest_checkpoint, load_config
+from .pruning import EvalResults, Pruner, make_pruner, read_eval_results
+
+# env settings that do not change the eval task, runs differing only in these
+# are compared with each other when pruning
+EVAL_TASK_IGNORED = ("normalize_action", "shared_geometry")
+
+SUMMARY_FIELDS = [
+    "name",
+    "status",
+    "returncode",
+    "cores",
+    "start_timestep",
+    "timestep",
+    "wall_time",
+    "steps_per_sec",
+    "success_rate",
+]
+
+
+def available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def eval_task(config: dict) -> str:
+    # the env the success rates are measured on, e.g. archvariety train or
+    # eval arches
+    eval_env = {**config["env"], **config["eval"]["env"]}
+    for key in EVAL_TASK_IGNORED:
+        eval_env.pop(key, None)
+    return yaml.safe_dump(eval_env, sort_keys=True, default_flow_style=True).strip()
+
+
+def required_cores(config: dict) -> int:
+    # one core per training env worker, one for the learner and one per eval
+    # env. Evaluations run only from time to time, but they run concurrently
+    # to training, so they are counted in full.
+    eval_config = config["eval"]
+    return (
+        config["training"]["n_envs"]
+        + 1
+        + eval_config["n_workers"] * eval_config["n_envs"]
+    )
+
+
+class Run:
+    def __init__(self, name: str, config_path: str, overrides: List[str]) -> None:
+        self.name = name
+        self.config_path = config_path
+        self.overrides = overrides
+        self.config = load_config(config_path, tuple(overrides))
+        self.cores = required_cores(self.config)
+        self.model_dir = self.config["training"]["model_dir"]
+        self.model_name = self.config["training"]["model_name"]
+        self.log_path = os.path.join(self.model_dir, f"{self.model_name}_train.log")
+        self.eval_log_path = self.config["eval"]["log_path"]
+        self.eval_results: EvalResults = []
+        self.eval_task = eval_task(self.config)
+        self.status = "queued"
+        self.process: Optional[subprocess.Popen] = None
+        self.returncode: Optional[int] = None
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.start_timestep = 0
+        self.timestep = 0
+        self.timestep_time: Optional[float] = None
+
+    @property
+    def command(self) -> List[str]:
+        command = [sys.executable, "-m", "eve_bench.training", self.config_path]
+        for override in self.overrides:
+            command += ["--set", override]
+        return command
+
+    @property
+    def wall_time(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.time()) - self.start_time
+
+    @property
+    def steps_per_sec(self) -> Optional[float]:
+        # from the checkpoints written since the start, the training harness
+        # saves one every save_interval steps
+        if self.timestep_time is None or self.timestep <= self.start_timestep:
+            return None
+        return (self.timestep - self.start_timestep) / (
+            self.timestep_time - self.start_time
+        )
+
+    def _latest_checkpoint(self) -> Tuple[Optional[str], int]:
+        if not os.path.isdir(self.model_dir):
+            return None, 0
+        return find_latest_checkpoint(self.model_dir, self.model_name)
+
+    def start(self) -> None:
+        os.makedirs(self.model_dir, exist_ok=True)
+        _, self.start_timestep = self._latest_checkpoint()
+        self.timestep = self.start_timestep
+        env = dict(os.environ)
+        # the learner gets a single core in the budget, keep torch and numpy
+        # from starting a thread per core in every run
+        env["OMP_NUM_THREADS"] = "1"
+        env["MKL_NUM_THREADS"] = "1"
+        env["PYTHONUNBUFFERED"] = "1"
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            self.process = subprocess.Popen(
+                self.command,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=env,
+                # own process group, so stop() also reaches the env workers
+                start_new_session=os.name == "posix",
+            )
+        self.start_time = time.time()
+        self.status = "running"
+
+    def poll(self) -> bool:
+        checkpoint, timestep = self._latest_checkpoint()
+        if checkpoint is not None and timestep > self.timestep:
+            self.timestep = timestep
+            self.timestep_time = os.path.getmtime(checkpoint)
+        self.eval_results = read_eval_results(self.eval_log_path)
+        self.returncode = self.process.poll()
+        if self.returncode is None:
+            return False
+        self.end_time = time.time()
+        if self.status == "running":
+            self.status = "finished" if self.returncode == 0 else "failed"
+        return True
+
+    def stop(self, status: str = "stopped") -> None:
+        if self.process is None or self.process.poll() is not None:
+            return
+        if os.name == "posix":
+            os.killpg(self.process.pid, signal.SIGTERM)
+        else:
+            self.process.terminate()
+        self.status = status
+
+    def summary(self) -> Dict[str, object]:
+        steps_per_sec = self.steps_per_sec
+        return {
+            "name": self.name,
+            "status": self.status,
+            "returncode": self.returncode,
+            "cores": self.cores,
+            "start_timestep": self.start_timestep,
+            "timestep": self.timestep,
+            "wall_time": f"{self.wall_time:.0f}",
+            "steps_per_sec": "" if steps_per_sec is None else f"{steps_per_sec:.1f}",
+            "success_rate": self.eval_results[-1][1] if self.eval_results else "",
+        }
+
+
+class SweepScheduler:
+    # Starts queued runs in order as long as their cores fit into the free
+    # cores, later runs that fit fill the gaps left by larger ones. A run
+    # that needs more than the whole machine starts only when it is idle.
+    # With a pruner, runs it rejects on their eval results are stopped and
+    # their cores go to the queued runs. Runs are only compared with runs of
+    # the same eval task.
+    def __init__(
+        self,
+        runs: List[Run],
+        cores: Optional[int] = None,
+        poll_interval: float = 10.0,
+        report_interval: float = 600.0,
+        summary_path: Optional[str] = None,
+        pruner: Optional[Pruner] = None,
+    ) -> None:
+        self.cores = cores or available_cores()
+        self.queue = list(runs)
+        self.running: List[Run] = []
+        self.done: List[Run] = []
+        self.poll_interval = poll_interval
+        self.report_interval = report_interval
+        self.summary_path = summary_path
+        self.pruner = pruner
+        self._last_report = 0.0
+
+    @property
+    def free_cores(self) -> int:
+        return self.cores - sum(run.cores for run in self.running)
+
+    def start_fitting_runs(self) -> None:
+        for run in list(self.queue):
+            fits = run.cores <= self.free_cores
+            if fits or (not self.running and run.cores > self.cores):
+                if not fits:
+                    print(
+                        f"{run.name} needs {run.cores} cores, running it alone on {self.cores}"
+                    )
+                self.queue.remove(run)
+                run.start()
+                self.running.append(run)
+                print(f"Started {run.name} on {run.cores} cores, log: {run.log_path}")
+
+    def poll(self) -> None:
+        for run in list(self.running):
+            if run.poll():
+                self.running.remove(run)
+                self.done.append(run)
+                print(f"{run.name} {run.status} after {run.wall_time:.0f} s")
+        if self.pruner is not None:
+            self.prune()
+
+    def prune(self) -> None:
+        # finished and pruned runs stay in the comparison. Success rates are
+        # only comparable between runs evaluated on the same task.
+        results: Dict[str, Dict[str, EvalResults]] = {}
+        for run in self.done + self.running:
+            results.setdefault(run.eval_task, {})[run.name] = run.eval_results
+        for run in self.running:
+            if run.status == "running" and self.pruner.should_stop(
+                run.name, results[run.eval_task]
+            ):
+                timestep, success_rate = run.eval_results[-1]
+                run.stop("pruned")
+                print(
+                    f"Pruned {run.name} at {timestep} steps, success rate {success_rate:.2f}"
+                )
+
+    def report(self) -> None:
+        print(
+            f"{len(self.running)} running, {len(self.queue)} queued, "
+            f"{len(self.done)} done, {self.cores - self.free_cores}/{self.cores} cores used"
+        )
+        total = 0.0
+        for run in self.running:
+            steps_per_sec = run.steps_per_sec
+            throughput = "-" if steps_per_sec is None else f"{steps_per_sec:.1f}"
+            success_rate = f"{run.eval_results[-1][1]:.2f}" if run.eval_results else "-"
+            print(
+                f" {run.name}: {run.timestep} steps, {throughput} steps/s, "
+                f"{run.cores} cores, success rate {success_rate}"
+            )
+            total += steps_per_sec or 0.0
+        print(f" total: {total:.1f} steps/s")
+
+    def write_summary(self) -> None:
+        if self.summary_path is None:
+            return
+        with open(self.summary_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            for run in self.done + self.running + self.queue:
+                writer.writerow(run.summary())
+
+    def step(self) -> None:
+        self.poll()
+        self.start_fitting_runs()
+        if time.time() - self._last_report >= self.report_interval:
+            self.report()
+            self.write_summary()
+            self._last_report = time.time()
+
+    def run(self) -> List[Run]:
+        try:
+            while self.queue or self.running:
+                self.step()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            for run in self.running:
+                run.stop()
+            for run in self.running:
+                run.process.wait()
+            self.poll()
+            raise
+        finally:
+            self.report()
+            self.write_summary()
+        return self.done
+
+
+def _run_name(config_path: str, grid_values: Dict[str, object]) -> str:
+    name = os.path.splitext(os.path.basename(config_path))[0]
+    for key, value in grid_values.items():
+        name += f"-{key.rsplit('.', 1)[-1]}={value}"
+    return re.sub(r"[^\w.=-]+", "_", name)
+
+
+def load_sweep(path: str) -> Tuple[List[Run], Optional[Pruner]]:
+    # configs are crossed with every combination of the grid values, output_dir
+    # moves model_dir and log_path of every run into <output_dir>/<run name>.
+    # The optional pruning section selects a rule of eve_bench.pruning.
+    with open(path, "r", encoding="utf-8") as file:
+        sweep = yaml.load(file, Loader=ConfigLoader) or {}
+    sweep_dir = os.path.dirname(os.path.abspath(path))
+    grid = sweep.get("grid") or {}
+    common = [
+        f"{key}={yaml.safe_dump(value, default_flow_style=True).strip()}"
+        for key, value in (sweep.get("overrides") or {}).items()
+    ]
+    output_dir = sweep.get("output_dir")
+    if output_dir is not None:
+        output_dir = os.path.expanduser(os.path.expandvars(output_dir))
+
+    runs = []
+    for config_path in sweep["configs"]:
+        config_path = os.path.join(sweep_dir, config_path)
+        for values in itertools.product(*grid.values()):
+            grid_values = dict(zip(grid.keys(), values))
+            name = _run_name(config_path, grid_values)
+            overrides = common + [
+                f"{key}={yaml.safe_dump(value, default_flow_style=True).strip()}"
+                for key, value in grid_values.items()
+            ]
+            if output_dir is not None:
+                run_dir = os.path.join(output_dir, name)
+                overrides += [
+                    f"training.model_dir={run_dir}",
+                    f"eval.log_path={os.path.join(run_dir, 'eval_results.csv')}",
+                ]
+            runs.append(Run(name, config_path, overrides))
+
+    outputs = {}
+    for run in runs:
+        output = (run.model_dir, run.model_name)
+        if output in outputs:
+            raise ValueError(
+                f"{run.name} and {outputs[output]} write to the same checkpoints {output}"
+            )
+        outputs[output] = run.name
+    pruning = sweep.get("pruning")
+    pruner = make_pruner(pruning) if pruning else None
+    return runs, pruner
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the training configs of a sweep, packed onto the cores of this machine"
+    )
+    parser.add_argument("sweep", help="yaml sweep file")
+    parser.add_argument(
+        "--cores", type=int, help="cores to use, default: all available"
+    )
+    parser.add_argument("--poll-interval", type=float, default=10.0)
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=600.0,
+        help="seconds between throughput reports",
+    )
+    parser.add_argument("--summary", help="csv with the status and throughput per run")
+    parser.add_argument(
+        "--no-pruning", action="store_true", help="ignore the pruning section"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="list the runs and their cores"
+    )
+    args = parser.parse_args(argv)
+
+    runs, pruner = load_sweep(args.sweep)
+    if args.no_pruning:
+        pruner = None
+    if args.dry_run:
+        for run in runs:
+            print(
+                f"{run.name}: {run.cores} cores, eval task {run.eval_task}, "
+                f"{' '.join(run.command)}"
+            )
+        if pruner is not None:
+            print(f"pruning: {type(pruner).__name__} {vars(pruner)}")
+        return 0
+    scheduler = SweepScheduler(
+        runs,
+        args.cores,
+        args.poll_interval,
+        args.report_interval,
+        args.summary,
+        pruner,
+    )
+    done = scheduler.run()
+    return 0 if all(run.status in ("finished", "pruned") for run in done) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+import os
+import re
+import argparse
+from functools import partial
+from typing import Callable, Optional, Tuple
+import numpy as np
+import yaml
+import gymnasium as gym
+import eve
+from stable_baselines3 import DDPG, PPO, SAC, TD3
+from stable_baselines3.common.base_class import BaseAlgorithm
+from stable_baselines3.common.noise import NormalActionNoise
+from stable_baselines3.common.vec_env import SubprocVecEnv, VecEnv
+
+from . import ArchVariety, Neurovascular2Ins, SharedGeometry, TablePathfinder
+from .evaluation import AsyncEvalCallback
+
+ALGORITHMS = {"PPO": PPO, "SAC": SAC, "TD3": TD3, "DDPG": DDPG}
+
+DEFAULT_CONFIG = {
+    "env": {},
+    "algorithm": {"policy": "MultiInputPolicy", "verbose": 1},
+    "training": {
+        "n_envs": 25,
+        "total_timesteps": 10000000,
+        "save_interval": 250000,
+    },
+    "eval": {
+        "freq": 250000,
+        "n_episodes": 100,
+        "n_workers": 1,
+        "n_envs": 10,
+        "env": {},
+    },
+}
+
+
+def _make_env(
+    intervention: eve.intervention.Intervention,
+    pathfinder: eve.pathfinder.Pathfinder,
+    state: eve.observation.Observation,
+    max_steps: int,
+    target_reward: eve.reward.Reward,
+) -> eve.Env:
+    step_reward = eve.reward.Step(factor=-0.005)
+    path_delta = eve.reward.PathLengthDelta(pathfinder=pathfinder, factor=0.001)
+    reward = eve.reward.Combination([target_reward, path_delta, step_reward])
+
+    target_reached = eve.terminal.TargetReached(intervention=intervention)
+    max_steps = eve.truncation.MaxSteps(max_steps)
+    vessel_end = eve.truncation.VesselEnd(intervention)
+    truncation = eve.truncation.Combination([max_steps, vessel_end])
+
+    path_ratio = eve.info.PathRatio(pathfinder)
+    steps = eve.info.Steps()
+    trans_speed = eve.info.AverageTranslationSpeed(intervention)
+    trajectory_length = eve.info.TrajectoryLength(intervention)
+    info = eve.info.Combination([path_ratio, steps, trans_speed, trajectory_length])
+
+    return eve.Env(
+        intervention=intervention,
+        observation=state,
+        reward=reward,
+        terminal=target_reached,
+        truncation=truncation,
+        start=eve.start.InsertionPoint(intervention=intervention),
+        pathfinder=pathfinder,
+        info=info,
+        interim_target=None,
+    )
+
+
+def _tracking(
+    intervention: eve.intervention.Intervention, **kwargs
+) -> eve.observation.Observation:
+    if "device_idx" in kwargs:
+        tracking = eve.observation.TrackingDevice2D(
+            intervention=intervention, n_points=3, resolution=2.0, **kwargs
+        )
+    else:
+        tracking = eve.observation.Tracking2D(
+            intervention=intervention, n_points=3, resolution=2.0, **kwargs
+        )
+    tracking = eve.observation.wrapper.NormalizeTracking2DEpisode(
+        tracking, intervention
+    )
+    return eve.observation.wrapper.Memory(
+        tracking, 2, eve.observation.wrapper.MemoryResetMode.FILL
+    )
+
+
+def _target_and_last_action(intervention: eve.intervention.Intervention) -> dict:
+    target_state = eve.observation.Target2D(intervention=intervention)
+    target_state = eve.observation.wrapper.NormalizeTracking2DEpisode(
+        target_state, intervention
+    )
+    last_action = eve.observation.LastAction(intervention)
+    last_action = eve.observation.wrapper.Normalize(last_action)
+    return {"target": target_state, "last_action": last_action}
+
+
+def make_archvariety_env(
+    variant: str = "train",
+    normalize_action: bool = False,
+    friction: float = 0.1,
+    max_steps: int = 200,
+) -> eve.Env:
+    intervention = ArchVariety(
+        variant=variant, normalize_action=normalize_action, friction=friction
+    )
+    pathfinder = eve.pathfinder.BruteForceBFS(intervention=intervention)
+    state = eve.observation.ObsDict(
+        {
+            "position": _tracking(intervention),
+            **_target_and_last_action(intervention),
+        }
+    )
+    target_reward = eve.reward.TargetReached(intervention=intervention, factor=1.0)
+    return _make_env(intervention, pathfinder, state, max_steps, target_reward)
+
+
+def make_neurovascular_env(
+    normalize_action: bool = False,
+    friction: float = 0.1,
+    max_steps: int = 500,
+    geometry: Optional[SharedGeometry] = None,
+) -> eve.Env:
+    intervention = Neurovascular2Ins(
+        normalize_action=normalize_action, geometry=geometry, friction=friction
+    )
+    pathfinder = TablePathfinder(intervention=intervention)
+    state = eve.observation.ObsDict(
+        {
+            "position_device1": _tracking(intervention, name="guid"),
+            "position_device2": _tracking(intervention, device_idx=1, name="cath"),
+            **_target_and_last_action(intervention),
+        }
+    )
+    target_reward = eve.reward.TargetReached(
+        intervention=intervention, factor=1.0, final_only_after_all_interim=False
+    )
+    return _make_env(intervention, pathfinder, state, max_steps, target_reward)
+
+
+ENVS = {
+    "archvariety": (make_archvariety_env, None),
+    "neurovascular": (make_neurovascular_env, Neurovascular2Ins.shared_geometry),
+}
+
+
+def _merge(base: dict, update: dict) -> dict:
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class ConfigLoader(yaml.SafeLoader):
+    pass
+
+
+# yaml 1.1 reads 1e-4 as a string, accept it as float like python does
+ConfigLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:float",
+    re.compile(r"^[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)[eE][-+]?[0-9]+$"),
+    list("-+0123456789."),
+)
+
+
+def _parse_override(override: str) -> dict:
+    key, separator, value = override.partition("=")
+    if not key or not separator:
+        raise ValueError(f"override {override!r} is not of the form key=value")
+    # dotted keys address nested entries, values are parsed as yaml
+    config = yaml.load(value, Loader=ConfigLoader)
+    for part in reversed(key.split(".")):
+        config = {part: config}
+    return config
+
+
+def load_config(path: str, overrides: Tuple[str, ...] = ()) -> dict:
+    with open(path, "r", encoding="utf-8") as file:
+        config = _merge(DEFAULT_CONFIG, yaml.load(file, Loader=ConfigLoader) or {})
+    for override in overrides:
+        config = _merge(config, _parse_override(override))
+
+    env_name = config["env"].get("name")
+    if env_name not in ENVS:
+        raise ValueError(f"env.name {env_name!r} not in {sorted(ENVS)}")
+    algorithm_name = config["algorithm"].get("name")
+    if algorithm_name not in ALGORITHMS:
+        raise ValueError(
+            f"algorithm.name {algorithm_name!r} not in {sorted(ALGORITHMS)}"
+        )
+    for section, key in (
+        ("training", "model_dir"),
+        ("training", "model_name"),
+        ("eval", "log_path"),
+    ):
+        if key not in config[section]:
+            raise ValueError(f"{section}.{key} is missing in {path}")
+    # paths may use ~ and environment variables, e.g. $SCRATCH on the cluster
+    for section, key in (("training", "model_dir"), ("eval", "log_path")):
+        config[section][key] = os.path.expanduser(
+            os.path.expandvars(config[section][key])
+        )
+    return config
+
+
+def make_env_factories(
+    env_config: dict, eval_env_config: Optional[dict] = None
+) -> Tuple[Callable[[], gym.Env], Callable[[], gym.Env], Optional[SharedGeometry]]:
+    # the eval env takes the training env settings, updated by eval_env_config
+    env_config = dict(env_config)
+    make_env, make_geometry = ENVS[env_config.pop("name")]
+    shared_geometry = env_config.pop("shared_geometry", False)
+    eval_env_config = {**env_config, **(eval_env_config or {})}
+    geometry = None
+    if shared_geometry:
+        if make_geometry is None:
+            raise ValueError("shared_geometry is not supported by this env")
+        geometry = make_geometry()
+        env_config["geometry"] = geometry
+        eval_env_config["geometry"] = geometry
+    return (
+        partial(make_env, **env_config),
+        partial(make_env, **eval_env_config),
+        geometry,
+    )
+
+
+def make_model(algorithm_config: dict, env: VecEnv) -> BaseAlgorithm:
+    kwargs = dict(algorithm_config)
+    algorithm = ALGORITHMS[kwargs.pop("name")]
+    policy = kwargs.pop("policy")
+    noise_std = kwargs.pop("action_noise", None)
+    if noise_std is not None:
+        n_actions = env.action_space.shape[-1]
+        kwargs["action_noise"] = NormalActionNoise(
+            mean=np.zeros((1, n_actions)), sigma=noise_std * np.ones((1, n_actions))
+        )
+    return algorithm(policy, env, **kwargs)
+
+
+def find_latest_checkpoint(
+    directory: str, model_name: str
+) -> Tuple[Optional[str], int]:
+    max_timestep = 0
+    latest_model_path = None
+    pattern = re.compile(rf"{re.escape(model_name)}_checkpoint_([0-9]+)\.zip")
+    for filename in os.listdir(directory):
+        match = pattern.fullmatch(filename)
+        if match:
+            timestep = int(match.group(1))
+            if timestep > max_timestep:
+                max_timestep = timestep
+                latest_model_path = os.path.join(directory, filename)
+    return latest_model_path, max_timestep
+
+
+def train(config: dict) -> str:
+    training = config["training"]
+    eval_config = config["eval"]
+    model_dir = training["model_dir"]
+    model_name = training["model_name"]
+    os.makedirs(model_dir, exist_ok=True)
+
+    env_factory, eval_env_factory, geometry = make_env_factories(
+        config["env"], eval_config["env"]
+    )
+    train_env = SubprocVecEnv([env_factory for _ in range(training["n_envs"])])
+    try:
+        latest_model, current_timestep = find_latest_checkpoint(model_dir, model_name)
+        if latest_model:
+            algorithm = ALGORITHMS[config["algorithm"]["name"]]
+            model = algorithm.load(latest_model, env=train_env)
+            print(
+                f"Resuming training from checkpoint: {latest_model} at timestep {current_timestep}"
+            )
+        else:
+            model = make_model(config["algorithm"], train_env)
+            print("Starting training from scratch")
+
+        eval_callback = AsyncEvalCallback(
+            eval_env_factory,
+            eval_freq=eval_config["freq"],
+            log_path=eval_config["log_path"],
+            start_step=current_timestep,
+            n_episodes=eval_config["n_episodes"],
+            n_workers=eval_config["n_workers"],
+            n_envs=eval_config["n_envs"],
+            verbose=1,
+        )
+        try:
+            total_timesteps = training["total_timesteps"]
+            save_interval = training["save_interval"]
+            while current_timestep < total_timesteps:
+                steps_to_run = min(save_interval, total_timesteps - current_timestep)
+                model.learn(
+                    total_timesteps=steps_to_run,
+                    reset_num_timesteps=False,
+                    callback=eval_callback,
+                )
+
+                current_timestep += steps_to_run
+                interim_save_path = os.path.join(
+                    model_dir, f"{model_name}_checkpoint_{current_timestep}.zip"
+                )
+                model.save(interim_save_path)
+                print(f"Checkpoint saved at {interim_save_path}")
+
+            final_model_path = os.path.join(model_dir, f"{model_name}_final.zip")
+            model.save(final_model_path)
+            print(f"Final model saved at: {final_model_path}")
+        finally:
+            eval_callback.close()
+    finally:
+        train_env.close()
+        if geometry is not None:
+            geometry.close()
+    return final_model_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train a stable-baselines3 agent on an eve_bench env from a yaml config."
+    )
+    parser.add_argument("config", help="yaml experiment config")
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="override a config entry, e.g. --set algorithm.learning_rate=1.0e-4",
+    )
+    parser.add_argument(
+        "--print-config",
+        action="store_true",
+        help="print the resolved config and exit",
+    )
+    args = parser.parse_args()
+    config = load_config(args.config, tuple(args.overrides))
+    if args.print_config:
+        print(yaml.safe_dump(config, sort_keys=False))
+    else:
+        train(config)
@@ -1,17 +1,15 @@
 from setuptools import setup, find_packages
-from glob import glob
 
-visu_mesh_data = glob("eve_bench10/aorticarch/arch_vmr94_util/*.stl")
 setup(
-    name="eve_bench10",
-    version="0.0",
+    name="eve_bench",
+    version="0.1",
     packages=find_packages(),
-    data_files=[
-        (
-            "visu_mesh_data",
-            visu_mesh_data,
-        ),
-    ],
+    package_data={
+        "eve_bench": [
+            "data/*.obj",
+            "data/Centrelines_comb/Centerline curve *.json",
+        ],
+    },
     include_package_data=True,
     install_requires=[
         "numpy",
@@ -26,4 +24,7 @@ setup(
         "matplotlib",
         "opencv-python",
     ],
+    extras_require={
+        "training": ["stable-baselines3", "cloudpickle", "pyyaml"],
+    },
 )
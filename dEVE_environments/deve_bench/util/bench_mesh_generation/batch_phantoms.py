@@ -0,0 +1,210 @@
+import os
+import json
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+from typing import List, Optional
+import eve.intervention.vesseltree
+
+KINDS = ["aorta", "aorta_with_struts", "vmr"]
+PROGRESS_FILE = "progress.jsonl"
+JOB_FILE = "job.json"
+# voxelizations of the vmr models, shared by all jobs of a batch
+VOXEL_CACHE_DIR = "vmr_voxel_cache"
+
+
+def get_job_hash(job: dict) -> str:
+    job_json = json.dumps(job, sort_keys=True)
+    return hashlib.sha1(job_json.encode("utf-8")).hexdigest()[:16]
+
+
+def get_job_dir(job: dict, output_root: str) -> str:
+    return os.path.join(output_root, f"{job['kind']}_{get_job_hash(job)}")
+
+
+def make_arch_jobs(
+    kind: str,
+    seeds: List[int],
+    scaling_xyzd: List[float] = [1.0, 1.0, 1.0, 0.85],
+    rotation_yzx_deg: List[float] = [0.0, 0.0, 0.0],
+    options: Optional[dict] = None,
+) -> List[dict]:
+    return [
+        {
+            "kind": kind,
+            "arch": {
+                "seed": seed,
+                "scaling_xyzd": list(scaling_xyzd),
+                "rotation_yzx_deg": list(rotation_yzx_deg),
+            },
+            "options": options or {},
+        }
+        for seed in seeds
+    ]
+
+
+def make_vmr_jobs(
+    model_ids: List[str], rot_z: float, rot_x: float, options: Optional[dict] = None
+) -> List[dict]:
+    return [
+        {
+            "kind": "vmr",
+            "options": {
+                "model_id": model_id,
+                "rot_z": rot_z,
+                "rot_x": rot_x,
+                **(options or {}),
+            },
+        }
+        for model_id in model_ids
+    ]
+
+
+def _generate(job: dict, output_dir: str, cache_dir: Optional[str] = None) -> None:
+    # imported here, so a worker only needs the dependencies of its own job kind
+    options = dict(job.get("options", {}))
+    if job["kind"] == "vmr":
+        from vmr_phantom import make_printable_vmr
+
+        make_printable_vmr(**options, output_dir=output_dir, cache_dir=cache_dir)
+        return
+
+    vessel_tree = eve.intervention.vesseltree.AorticArch(**job["arch"])
+    vessel_tree.reset()
+    if job["kind"] == "aorta":
+        from print_aorta import print_obj_from_selfmade
+
+        print_obj_from_selfmade(vessel_tree, **options, output_dir=output_dir)
+        return
+
+    from print_aorta_with_struts import print_obj_from_selfmade
+    from search_strut_layout import search_strut_layout
+
+    grid_offset = options.setdefault("grid_offset", [0.0, 0.0])
+    if options.get("struts") is None:
+        layout = search_strut_layout(vessel_tree, grid_offset)
+        if layout is None:
+            raise RuntimeError(f"no valid strut layout for {job['arch']}")
+        options["struts"] = layout["struts"]
+    print_obj_from_selfmade(vessel_tree, **options, output_dir=output_dir)
+
+
+def run_job(job: dict, output_root: str, cache_dir: Optional[str] = None) -> dict:
+    job_dir = get_job_dir(job, output_root)
+    job_file = os.path.join(job_dir, JOB_FILE)
+    if os.path.exists(job_file):
+        with open(job_file, "r", encoding="utf-8") as file:
+            result = json.load(file)
+        result["skipped"] = True
+        return result
+
+    # meshes are written to a temporary dir, so an interrupted job leaves no
+    # job dir behind and is simply run again
+    tmp_dir = job_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    start = perf_counter()
+    _generate(job, tmp_dir, cache_dir)
+    result = {
+        "job": job,
+        "hash": get_job_hash(job),
+        "time": perf_counter() - start,
+        "files": sorted(os.listdir(tmp_dir)),
+        "skipped": False,
+    }
+    with open(os.path.join(tmp_dir, JOB_FILE), "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2)
+    shutil.rmtree(job_dir, ignore_errors=True)
+    os.replace(tmp_dir, job_dir)
+    return result
+
+
+def run_batch(
+    jobs: List[dict],
+    output_root: str,
+    n_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> List[dict]:
+    os.makedirs(output_root, exist_ok=True)
+    # outside of the job dirs, so it is not published with the meshes and
+    # jobs differing only in wall or extension settings reuse the voxelization
+    cache_dir = cache_dir or os.path.join(output_root, VOXEL_CACHE_DIR)
+    progress_path = os.path.join(output_root, PROGRESS_FILE)
+    results = []
+    with ProcessPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(run_job, job, output_root, cache_dir): job for job in jobs
+        }
+        for i, future in enumerate(as_completed(futures)):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                result = {"job": job, "hash": get_job_hash(job), "error": repr(error)}
+            results.append(result)
+            with open(progress_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(result) + "\n")
+
+            if "error" in result:
+                status = f"failed: {result['error']}"
+            elif result["skipped"]:
+                status = "skipped, exists"
+            else:
+                status = f"done in {result['time']:.1f} s"
+            print(f"[{i + 1}/{len(jobs)}] {job['kind']}_{result['hash']} {status}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate phantom meshes in batch")
+    parser.add_argument("--kind", choices=KINDS, default="aorta")
+    parser.add_argument("--jobs", help="json file with a list of jobs")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[])
+    parser.add_argument(
+        "--archvariety-seeds",
+        action="store_true",
+        help="use the seeds of the ArchVariety eval variant",
+    )
+    parser.add_argument("--scaling", type=float, nargs=4, default=[1.0, 1.0, 1.0, 0.85])
+    parser.add_argument("--rotation", type=float, nargs=3, default=[0.0, 0.0, 0.0])
+    parser.add_argument("--grid-offset", type=float, nargs=2, default=[0.0, 0.0])
+    parser.add_argument("--z-split", type=float, default=None)
+    parser.add_argument("--vmr-models", nargs="+", default=[])
+    parser.add_argument("--rot-z", type=float, default=0.0)
+    parser.add_argument("--rot-x", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="phantoms")
+    parser.add_argument(
+        "--voxel-cache",
+        default=None,
+        help=f"vmr voxelization cache, default: <output>/{VOXEL_CACHE_DIR}",
+    )
+    args = parser.parse_args()
+
+    if args.jobs is not None:
+        with open(args.jobs, "r", encoding="utf-8") as file:
+            batch = json.load(file)
+    elif args.kind == "vmr":
+        batch = make_vmr_jobs(
+            args.vmr_models, args.rot_z, args.rot_x, {"z_split": args.z_split}
+        )
+    else:
+        seeds = args.seeds
+        if args.archvariety_seeds:
+            from eve_bench.archvariety import VARIANTS
+
+            seeds = seeds + VARIANTS["eval"]
+        job_options = {"z_split": args.z_split}
+        if args.kind == "aorta_with_struts":
+            job_options["grid_offset"] = args.grid_offset
+        batch = make_arch_jobs(
+            args.kind, seeds, args.scaling, args.rotation, job_options
+        )
+
+    if not batch:
+        parser.error(
+            "no jobs, give --jobs, --seeds, --archvariety-seeds or --vmr-models"
+        )
+    run_batch(batch, args.output, args.workers, args.voxel_cache)
@@ -0,0 +1,139 @@
+from typing import Tuple
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.spatial import cKDTree
+import eve.intervention.vesseltree
+
+from eve.intervention.vesseltree.vesseltree import VesselTree
+from eve.intervention.vesseltree import BranchWithRadii
+
+GRID_SPACING = 10.0
+STRUT_RADIUS = 4.0
+
+
+def get_vessel_xz(vesseltree: VesselTree) -> Tuple[np.ndarray, np.ndarray]:
+    coords = np.concatenate([branch.coordinates for branch in vesseltree.branches])
+    radii = np.concatenate([branch.radii for branch in vesseltree.branches])
+    return np.delete(coords, 1, axis=-1), radii
+
+
+def get_strut_grid(
+    vesseltree: VesselTree,
+    grid_offset: Tuple[float, float] = [0.0, 0.0],
+    z_margin_low: float = 20.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # grid indices (i, j) are at x = i * 10 + offset_x, z = j * 10 + offset_z,
+    # the same convention as the struts of print_aorta_with_struts
+    coords_xz, _ = get_vessel_xz(vesseltree)
+    low = (coords_xz.min(axis=0) - [0.0, z_margin_low] - grid_offset) / GRID_SPACING
+    high = (coords_xz.max(axis=0) - grid_offset) / GRID_SPACING
+    grid_i, grid_j = np.meshgrid(
+        np.arange(np.floor(low[0]), np.ceil(high[0]) + 1, dtype=int),
+        np.arange(np.floor(low[1]), np.ceil(high[1]) + 1, dtype=int),
+    )
+    return grid_i, grid_j
+
+
+def grid_to_xz(
+    grid_i: np.ndarray,
+    grid_j: np.ndarray,
+    grid_offset: Tuple[float, float] = [0.0, 0.0],
+) -> np.ndarray:
+    return np.stack(
+        [
+            grid_i * GRID_SPACING + grid_offset[0],
+            grid_j * GRID_SPACING + grid_offset[1],
+        ],
+        axis=-1,
+    )
+
+
+def get_vessel_clearance(vesseltree: VesselTree, points_xz: np.ndarray) -> np.ndarray:
+    # distance of every xz point to the nearest vessel cross-section surface,
+    # negative inside the vessel
+    coords_xz, radii = get_vessel_xz(vesseltree)
+    tree = cKDTree(coords_xz)
+    points_flat = points_xz.reshape(-1, 2)
+
+    # min(d_i - r_i) can only be reached by points with
+    # d_i <= d_nearest - r_nearest + r_max
+    dist_nearest, idx_nearest = tree.query(points_flat)
+    clearance = dist_nearest - radii[idx_nearest]
+    search_radius = clearance + radii.max()
+    candidates = tree.query_ball_point(points_flat, np.maximum(search_radius, 0.0))
+    for i, candidate in enumerate(candidates):
+        if candidate:
+            dist = np.linalg.norm(coords_xz[candidate] - points_flat[i], axis=-1)
+            clearance[i] = min(clearance[i], np.min(dist - radii[candidate]))
+    return clearance.reshape(points_xz.shape[:-1])
+
+
+def get_strut_clearance(
+    vesseltree: VesselTree,
+    grid_offset: Tuple[float, float] = [0.0, 0.0],
+    strut_radius: float = STRUT_RADIUS,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    grid_i, grid_j = get_strut_grid(vesseltree, grid_offset)
+    points_xz = grid_to_xz(grid_i, grid_j, grid_offset)
+    clearance = get_vessel_clearance(vesseltree, points_xz) - strut_radius
+    return grid_i, grid_j, clearance
+
+
+def get_valid_strut_positions(
+    vesseltree: VesselTree,
+    grid_offset: Tuple[float, float] = [0.0, 0.0],
+    strut_radius: float = STRUT_RADIUS,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    grid_i, grid_j, clearance = get_strut_clearance(
+        vesseltree, grid_offset, strut_radius
+    )
+    return grid_i, grid_j, clearance > 0
+
+
+def plot_strut_positions(
+    vesseltree: VesselTree,
+    grid_offset: Tuple[float, float] = [0.0, 0.0],
+    strut_radius: float = STRUT_RADIUS,
+):
+    grid_i, grid_j, valid = get_valid_strut_positions(
+        vesseltree, grid_offset, strut_radius
+    )
+    points_xz = grid_to_xz(grid_i, grid_j, grid_offset)
+
+    ax = plt.gca()
+    for branch in vesseltree.branches:
+        for point, radius in zip(branch.coordinates, branch.radii):
+            point = np.delete(point, 1)
+            circle = plt.Circle(point, radius, color="r")
+            ax.add_patch(circle)
+
+    for point in points_xz[valid]:
+        circle = plt.Circle(point, strut_radius, color="b")
+        ax.add_patch(circle)
+
+    ax.scatter(
+        points_xz[..., 0].ravel(),
+        points_xz[..., 1].ravel(),
+        c=np.where(valid, "b", "k").ravel(),
+    )
+    ax.set_aspect("equal")
+    plt.show()
+
+
+def get_strut_pos(
+    vesseltree: VesselTree, grid_offset: Tuple[float, float] = [0.0, 0.0]
+):
+    plot_strut_positions(vesseltree, grid_offset)
+
+
+if __name__ == "__main__":
+    vessel_tree = eve.intervention.vesseltree.AorticArch(
+        seed=661023725,
+        rotation_yzx_deg=[0, -25, 0],
+        scaling_xyzd=[0.7526567834727076, 0.7526567834727076, 0.7254665311210199, 0.85],
+    )
+    vessel_tree.reset()
+
+    grid_i, grid_j, valid = get_valid_strut_positions(vessel_tree)
+    print(np.stack([grid_i[valid], grid_j[valid]], axis=-1).tolist())
+    plot_strut_positions(vessel_tree)
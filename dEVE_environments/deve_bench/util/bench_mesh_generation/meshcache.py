@@ -0,0 +1,140 @@
+import os
+import json
+import argparse
+import hashlib
+from enum import Enum
+from typing import Dict, List, Optional
+import numpy as np
+from eve.intervention.vesseltree.util.meshing import save_mesh
+from eve.intervention.vesseltree.vesseltree import VesselTree
+
+CACHE_VERSION = 2
+MANIFEST = "manifest.json"
+
+
+def _to_builtin(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Enum):
+        return str(value)
+    raise TypeError(f"{type(value)} is not json serializable")
+
+
+def get_params_key(params: dict) -> str:
+    params_json = json.dumps(
+        {"version": CACHE_VERSION, "params": params},
+        sort_keys=True,
+        default=_to_builtin,
+    )
+    return hashlib.sha1(params_json.encode("utf-8")).hexdigest()
+
+
+def get_tree_params(vesseltree: VesselTree) -> dict:
+    return {
+        "type": type(vesseltree).__name__,
+        "arch_type": vesseltree.arch_type,
+        "seed": vesseltree.seed,
+        "scaling_xyzd": vesseltree.scaling_xyzd,
+        "rotation_yzx_deg": vesseltree.rotation_yzx_deg,
+        "omit_axis": vesseltree.omit_axis,
+    }
+
+
+def get_file_hash(path: str) -> str:
+    file_hash = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+class MeshCache:
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST)
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _write_manifest(self, manifest: Dict[str, dict]) -> None:
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True, default=_to_builtin)
+        os.replace(tmp_path, self.manifest_path)
+
+    def get_path(self, name: str, params: dict) -> str:
+        return os.path.join(self.cache_dir, f"{name}_{get_params_key(params)[:16]}.obj")
+
+    def get(self, name: str, params: dict) -> Optional[str]:
+        # cheap check on load, full content hashes are compared in stale_entries
+        path = self.get_path(name, params)
+        entry = self._read_manifest().get(os.path.basename(path))
+        if entry is None or not os.path.exists(path):
+            return None
+        if os.path.getsize(path) != entry["size"]:
+            return None
+        return path
+
+    def put(self, name: str, params: dict, mesh) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.get_path(name, params)
+        root, ext = os.path.splitext(path)
+        tmp_path = f"{root}.{os.getpid()}.tmp{ext}"
+        save_mesh(mesh, tmp_path)
+        os.replace(tmp_path, path)
+
+        # read again right before writing, other processes may share the dir
+        manifest = self._read_manifest()
+        manifest[os.path.basename(path)] = {
+            "name": name,
+            "key": get_params_key(params),
+            "version": CACHE_VERSION,
+            "params": params,
+            "size": os.path.getsize(path),
+            "sha1": get_file_hash(path),
+        }
+        self._write_manifest(manifest)
+        return path
+
+    def stale_entries(self) -> List[str]:
+        # entries of an older cache version or whose file is missing or changed
+        stale = []
+        for file_name, entry in self._read_manifest().items():
+            path = os.path.join(self.cache_dir, file_name)
+            if (
+                entry["version"] != CACHE_VERSION
+                or not os.path.exists(path)
+                or get_file_hash(path) != entry["sha1"]
+            ):
+                stale.append(file_name)
+        return stale
+
+    def remove_stale(self) -> List[str]:
+        stale = self.stale_entries()
+        manifest = self._read_manifest()
+        for file_name in stale:
+            manifest.pop(file_name, None)
+            path = os.path.join(self.cache_dir, file_name)
+            if os.path.exists(path):
+                os.remove(path)
+        self._write_manifest(manifest)
+        return stale
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a generated mesh cache")
+    parser.add_argument("cache_dir")
+    parser.add_argument("--remove", action="store_true", help="delete stale meshes")
+    args = parser.parse_args()
+
+    mesh_cache = MeshCache(args.cache_dir)
+    stale_files = (
+        mesh_cache.remove_stale() if args.remove else mesh_cache.stale_entries()
+    )
+    for stale_file in stale_files:
+        print(f"stale: {stale_file}")
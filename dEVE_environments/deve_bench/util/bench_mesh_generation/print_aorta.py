@@ -0,0 +1,140 @@
+import os
+import numpy as np
+import eve.intervention.vesseltree
+from eve.intervention.vesseltree.util.branch import BranchWithRadii
+from eve.intervention.vesseltree.vesseltree import VesselTree, at_tree_end
+from smoothing import gaussian_smooth
+from voxellayers import VoxelLayers
+from meshcache import MeshCache, get_tree_params
+from slabmesh import get_slab_surface_mesh, get_split_ranges
+
+SPACING = [0.3, 0.3, 0.3]
+PADDING = 100
+SMOOTHING = [1, 1, 1, 1.0, 0.7]
+DECIMATION = 0.95
+
+
+def print_obj_from_selfmade(
+    vesseltree: VesselTree,
+    z_split: float = None,
+    z_remove_lower: float = None,
+    z_remove_upper: float = None,
+    output_dir: str = None,
+):
+    dir_path = output_dir or os.path.dirname(os.path.realpath(__file__))
+    mesh_cache = MeshCache(dir_path)
+    params = {
+        "script": "print_aorta",
+        "vessel_tree": get_tree_params(vesseltree),
+        "spacing": SPACING,
+        "padding": PADDING,
+        "smoothing": SMOOTHING,
+        "decimation": DECIMATION,
+    }
+    split_params = {
+        **params,
+        "z_split": z_split,
+        "z_remove_lower": z_remove_lower,
+        "z_remove_upper": z_remove_upper,
+    }
+    artifacts = {"aorta_full": params}
+    if z_split is not None:
+        artifacts["aorta_lower"] = split_params
+        artifacts["aorta_upper"] = split_params
+    paths = {name: mesh_cache.get(name, artifacts[name]) for name in artifacts}
+    if all(paths.values()):
+        return paths
+
+    layers = VoxelLayers(vesseltree, SPACING, [PADDING] * 3, [PADDING] * 3)
+    voxel_cube = layers["vessel"]
+
+    for branch in vesseltree:
+        voxel_cube.mark_centerline_in_array(
+            branch.coordinates, branch.radii, marking_value=1, radius_padding=1.5
+        )
+    for branch in vesseltree:
+        voxel_cube.mark_centerline_in_array(
+            branch.coordinates, branch.radii, marking_value=0, radius_padding=0
+        )
+
+    end_extensions = []
+    for branch in vesseltree:
+        start = branch.coordinates[0]
+        if at_tree_end(start, vesseltree):
+            new_branch = extend_branch_end(branch, "start", 20)
+            end_extensions.append(new_branch)
+
+        end = branch.coordinates[-1]
+        if at_tree_end(end, vesseltree):
+            new_branch = extend_branch_end(branch, "end", 20)
+            end_extensions.append(new_branch)
+    for branch in end_extensions:
+        radius = 4 if branch.name == "aorta" else 2
+        voxel_cube.mark_centerline_in_array(
+            branch.coordinates, marking_value=0, cl_radii=radius
+        )
+
+    gaussian_smooth(voxel_cube, SMOOTHING)
+
+    mesh = get_slab_surface_mesh(voxel_cube, "ascent", decimation=DECIMATION)
+    paths["aorta_full"] = mesh_cache.put("aorta_full", params, mesh)
+    if z_split is not None:
+        (lower_low, lower_high), (upper_low, upper_high) = get_split_ranges(
+            voxel_cube, z_split, z_remove_lower, z_remove_upper
+        )
+        mesh = get_slab_surface_mesh(
+            voxel_cube,
+            "ascent",
+            z_low=lower_low,
+            z_high=lower_high,
+            decimation=DECIMATION,
+        )
+        paths["aorta_lower"] = mesh_cache.put("aorta_lower", split_params, mesh)
+
+        mesh = get_slab_surface_mesh(
+            voxel_cube,
+            "ascent",
+            z_low=upper_low,
+            z_high=upper_high,
+            decimation=DECIMATION,
+        )
+        paths["aorta_upper"] = mesh_cache.put("aorta_upper", split_params, mesh)
+    return paths
+
+
+def extend_branch_end(branch: BranchWithRadii, start_end: str, length: int):
+    if start_end == "start":
+        coord_idx = 0
+        direction_idx = 1
+    else:
+        coord_idx = -1
+        direction_idx = -2
+    coord_start = branch.coordinates[coord_idx]
+    direction = branch.coordinates[coord_idx] - branch.coordinates[direction_idx]
+    direction = direction / np.linalg.norm(direction)
+    coord_end = coord_start + length * direction
+
+    radius = branch.radii[coord_idx]
+
+    new_points = np.linspace(
+        coord_end, coord_start, num=int(np.ceil(length)), endpoint=False
+    )
+    if not start_end == "start":
+        new_points = np.flip(new_points, axis=0)
+
+    n_points = new_points.shape[0]
+
+    new_radii = np.ones([n_points]) * radius
+
+    return BranchWithRadii(branch.name, new_points, new_radii)
+
+
+if __name__ == "__main__":
+    vessel_tree = eve.intervention.vesseltree.AorticArch(
+        seed=1669028594,
+        rotation_yzx_deg=[0, -25, 0],
+        scaling_xyzd=[0.9995400602406534, 0.9995400602406534, 0.8178605960609021, 0.85],
+    )
+    vessel_tree.reset()
+
+    print_obj_from_selfmade(vessel_tree, z_split=100)
@@ -1,13 +1,8 @@
-from copy import deepcopy
 import os
 from typing import List, Tuple
 import numpy as np
 import eve.intervention.vesseltree
-from eve.intervention.vesseltree.util.meshing import get_surface_mesh, save_mesh
-from eve.intervention.vesseltree.util.voxelcube import (
-    create_empty_voxel_cube_from_branches,
-    VoxelCube,
-)
+from eve.intervention.vesseltree.util.voxelcube import VoxelCube
 from eve.intervention.vesseltree.util.branch import BranchWithRadii
 from eve.intervention.vesseltree.vesseltree import (
     VesselTree,
@@ -15,6 +10,25 @@ from eve.intervention.vesseltree.vesseltree import (
     find_nearest_branch_to_point,
 )
 import skimage.filters
+from smoothing import gaussian_smooth
+from voxellayers import VoxelLayers
+from voxelstamp import (
+    world_to_index,
+    stamp_cylinder_y,
+    stamp_disk_xz,
+    stamp_line_z,
+)
+from meshcache import MeshCache, get_tree_params
+from slabmesh import get_slab_surface_mesh, get_split_ranges
+
+SPACING = [0.25, 0.25, 0.25]
+PADDING_LOW = [20, 20, 20]
+PADDING_HIGH = [20, 70, 20]
+STRUT_SMOOTHING = [1, 0.4]
+SMOOTHING = [1, 1, 1, 1, 0.7]
+DECIMATION = 0.8
+LEVEL = 0.6
+INSERTION_LEVEL = 0.5
 
 
 def print_obj_from_selfmade(
@@ -24,32 +38,116 @@ def print_obj_from_selfmade(
     z_split: float = None,
     z_remove_lower: float = None,
     z_remove_upper: float = None,
+    output_dir: str = None,
 ):
-    spacing = [0.25, 0.25, 0.25]
-    voxel_cube = create_empty_voxel_cube_from_branches(vesseltree, spacing)
+    dir_path = output_dir or os.path.dirname(os.path.realpath(__file__))
+    mesh_cache = MeshCache(dir_path)
+    params = {
+        "script": "print_aorta_with_struts",
+        "vessel_tree": get_tree_params(vesseltree),
+        "spacing": SPACING,
+        "padding": [PADDING_LOW, PADDING_HIGH],
+        "smoothing": [SMOOTHING, STRUT_SMOOTHING],
+        "decimation": DECIMATION,
+        "grid_offset": grid_offset,
+    }
+    insertion_params = {**params, "level": INSERTION_LEVEL}
+    params = {**params, "struts": struts, "level": LEVEL}
+    split_params = {
+        **params,
+        "z_split": z_split,
+        "z_remove_lower": z_remove_lower,
+        "z_remove_upper": z_remove_upper,
+    }
+    artifacts = {"aorta_with_struts_full": params}
+    if z_split is not None:
+        artifacts["aorta_with_struts_lower"] = split_params
+        artifacts["aorta_with_struts_upper"] = split_params
+    paths = {name: mesh_cache.get(name, artifacts[name]) for name in artifacts}
 
-    for _ in range(50):
-        voxel_cube.add_padding_layer("y", dimension_end="high")
-    for _ in range(20):
-        voxel_cube.add_padding_layer_all_sides()
+    strut_start_y = vesseltree.coordinate_space_episode.high[1]
+    strut_start_y += 10.5
+    strut_start_y = np.ceil(strut_start_y / SPACING[1]) * SPACING[1]
 
-    voxel_cube_struts = deepcopy(voxel_cube)
+    if not all(paths.values()):
+        voxel_cube = get_aorta_with_struts_voxel_cube(
+            vesseltree, struts, grid_offset, strut_start_y
+        )
+        mesh = get_slab_surface_mesh(
+            voxel_cube, "ascent", level=LEVEL, decimation=DECIMATION
+        )
+        paths["aorta_with_struts_full"] = mesh_cache.put(
+            "aorta_with_struts_full", params, mesh
+        )
+        if z_split is not None:
+            (lower_low, lower_high), (upper_low, upper_high) = get_split_ranges(
+                voxel_cube, z_split, z_remove_lower, z_remove_upper
+            )
+            mesh = get_slab_surface_mesh(
+                voxel_cube,
+                "ascent",
+                level=LEVEL,
+                z_low=lower_low,
+                z_high=lower_high,
+                decimation=DECIMATION,
+            )
+            paths["aorta_with_struts_lower"] = mesh_cache.put(
+                "aorta_with_struts_lower", split_params, mesh
+            )
+
+            mesh = get_slab_surface_mesh(
+                voxel_cube,
+                "ascent",
+                level=LEVEL,
+                z_low=upper_low,
+                z_high=upper_high,
+                decimation=DECIMATION,
+            )
+            paths["aorta_with_struts_upper"] = mesh_cache.put(
+                "aorta_with_struts_upper", split_params, mesh
+            )
+
+    paths["aorta_with_struts_insertion"] = mesh_cache.get(
+        "aorta_with_struts_insertion", insertion_params
+    )
+    if paths["aorta_with_struts_insertion"] is None:
+        voxel_cube_insertion = get_insertion_voxel_cube(
+            vesseltree, strut_start_y, SPACING, grid_offset
+        )
+        mesh = get_slab_surface_mesh(
+            voxel_cube_insertion,
+            "ascent",
+            level=INSERTION_LEVEL,
+            decimation=DECIMATION,
+        )
+        paths["aorta_with_struts_insertion"] = mesh_cache.put(
+            "aorta_with_struts_insertion", insertion_params, mesh
+        )
+    return paths
+
+
+def get_aorta_with_struts_voxel_cube(
+    vesseltree: VesselTree,
+    struts: List[Tuple[int, int]],
+    grid_offset: Tuple[float, float],
+    strut_start_y: float,
+) -> VoxelCube:
+    layers = VoxelLayers(vesseltree, SPACING, PADDING_LOW, PADDING_HIGH)
+    voxel_cube = layers["vessel"]
+    voxel_cube_struts = layers["struts"]
 
     start_rectangles = []
-    strut_start_y = vessel_tree.coordinate_space_episode.high[1]
-    strut_start_y += 10.5
-    strut_start_y = np.ceil(strut_start_y / spacing[1]) * spacing[1]
     for strut in struts:
         strut_x = strut[0] * 10 + grid_offset[0]
         strut_z = strut[1] * 10 + grid_offset[1]
 
         strut_xz = np.array([strut_x, strut_z])
-        cl_coords = vessel_tree.centerline_coordinates
+        cl_coords = vesseltree.centerline_coordinates
         cl_coords_xz = np.delete(cl_coords, 1, axis=-1)
         strut_to_cl_xz_dist = np.linalg.norm(cl_coords_xz - strut_xz, axis=-1)
         nearest_cl_idx = np.argmin(strut_to_cl_xz_dist)
         strut_end_y = cl_coords[nearest_cl_idx][1]
-        strut_end_y = np.floor(strut_end_y / spacing[1]) * spacing[1]
+        strut_end_y = np.floor(strut_end_y / SPACING[1]) * SPACING[1]
 
         strut_end = np.array([strut_x, strut_end_y, strut_z])
         strut_start = np.array([strut_x, strut_start_y, strut_z])
@@ -62,9 +160,7 @@ def print_obj_from_selfmade(
 
         mark_second_cylinder(voxel_cube_struts, start_sec_cyl, strut_end)
 
-    voxel_cube_struts.gaussian_smooth(1)
-    voxel_cube_struts.gaussian_smooth(0.4)
-    # voxel_cube_struts.gaussian_smooth(0.4)
+    gaussian_smooth(voxel_cube_struts, STRUT_SMOOTHING)
 
     for start_rectangle in start_rectangles:
         mark_rectangle(voxel_cube_struts, start_rectangle)
@@ -84,12 +180,12 @@ def print_obj_from_selfmade(
     end_extensions = []
     for branch in vesseltree:
         start = branch.coordinates[0]
-        if at_tree_end(start, vessel_tree):
+        if at_tree_end(start, vesseltree):
             new_branch = extend_branch_end(branch, "start", 20)
             end_extensions.append(new_branch)
 
         end = branch.coordinates[-1]
-        if at_tree_end(end, vessel_tree):
+        if at_tree_end(end, vesseltree):
             new_branch = extend_branch_end(branch, "end", 20)
             end_extensions.append(new_branch)
     for branch in end_extensions:
@@ -98,123 +194,27 @@ def print_obj_from_selfmade(
             branch.coordinates, marking_value=0, cl_radii=radius
         )
 
-    voxel_cube.gaussian_smooth(1)
-    voxel_cube.gaussian_smooth(1)
-    voxel_cube.gaussian_smooth(1)
+    gaussian_smooth(voxel_cube, SMOOTHING)
 
-    # voxel_cube.gaussian_smooth(1)
-    voxel_cube.gaussian_smooth(1)
-    voxel_cube.gaussian_smooth(0.7)
-
-    voxel_cube.value_array = np.add(
-        voxel_cube.value_array, voxel_cube_struts.value_array
-    )
-
-    mesh = get_surface_mesh(voxel_cube, "ascent", level=0.6)
-    # mesh = mesh.decimate_pro(0.9)
-    mesh = mesh.decimate(0.8)
-    # cwd = os.getcwd()
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    save_mesh(
-        mesh,
-        os.path.join(
-            dir_path,
-            f"aorta_with_struts_type_{vessel_tree.arch_type}_seed_{vessel_tree.seed}_scale_{vessel_tree.scaling_xyzd}_rot_{vessel_tree.rotation_yzx_deg}_omit_{vessel_tree.omit_axis}_full.obj",
-        ),
-    )
-    if z_split is not None:
-        z_split_idx = int(z_split / voxel_cube.spacing[2])
-
-        lower_model = VoxelCube(
-            voxel_cube.value_array.copy(),
-            voxel_cube.spacing,
-            voxel_cube.world_offset,
-        )
-        lower_model.value_array[:, :, z_split_idx:] = 0
-        if z_remove_lower is not None:
-            z_remove_lower_idx = int(z_remove_lower / voxel_cube.spacing[2])
-            lower_model.value_array[:, :, :z_remove_lower_idx] = 0
-
-        upper_model = VoxelCube(
-            voxel_cube.value_array.copy(),
-            voxel_cube.spacing,
-            voxel_cube.world_offset,
-        )
-        upper_model.value_array[:, :, :z_split_idx] = 0
-        if z_remove_upper is not None:
-            z_remove_upper_idx = int(z_remove_upper / voxel_cube.spacing[2])
-            lower_model.value_array[:, :, z_remove_upper_idx:] = 0
-
-        mesh = get_surface_mesh(lower_model, "ascent", level=0.6)
-        mesh.decimate(0.8, inplace=True)
-        save_mesh(
-            mesh,
-            os.path.join(
-                dir_path,
-                f"aorta_with_struts_type_{vessel_tree.arch_type}_seed_{vessel_tree.seed}_scale_{vessel_tree.scaling_xyzd}_rot_{vessel_tree.rotation_yzx_deg}_omit_{vessel_tree.omit_axis}_split{z_split}_lower.obj",
-            ),
-        )
-
-        mesh = get_surface_mesh(upper_model, "ascent", level=0.6)
-        mesh.decimate(0.8, inplace=True)
-        save_mesh(
-            mesh,
-            os.path.join(
-                dir_path,
-                f"aorta_with_struts_type_{vessel_tree.arch_type}_seed_{vessel_tree.seed}_scale_{vessel_tree.scaling_xyzd}_rot_{vessel_tree.rotation_yzx_deg}_omit_{vessel_tree.omit_axis}_split{z_split}_upper.obj",
-            ),
-        )
-
-    voxel_cube_insertion = get_insertion_voxel_cube(
-        vessel_tree, strut_start_y, spacing, grid_offset
-    )
-
-    mesh = get_surface_mesh(voxel_cube_insertion, "ascent", level=0.5)
-    mesh.decimate(0.8, inplace=True)
-    save_mesh(
-        mesh,
-        os.path.join(
-            dir_path,
-            f"aorta_with_struts_type_{vessel_tree.arch_type}_seed_{vessel_tree.seed}_scale_{vessel_tree.scaling_xyzd}_rot_{vessel_tree.rotation_yzx_deg}_omit_{vessel_tree.omit_axis}_insertion.obj",
-        ),
-    )
+    voxel_cube = layers.combine(["vessel", "struts"])
+    return voxel_cube
 
 
 def mark_first_cylinder(voxel_cube: VoxelCube, strut_start: np.ndarray):
-    voxel_coords = voxel_cube.voxel_coords
-
-    dist_to_start = np.linalg.norm(voxel_coords - strut_start, axis=-1)
-    start_voxel = np.argmin(dist_to_start)
-    start_voxel = np.unravel_index(start_voxel, dist_to_start.shape)
+    start_voxel = world_to_index(voxel_cube, strut_start)
 
     n_voxels = 2 / voxel_cube.spacing[1]
     n_voxels = int(n_voxels)
     radii = [2.5] * n_voxels
     # radii[0] = radii[-1] = 2.249
 
-    for i in range(n_voxels):
-        radius = radii[i]
-        idx_y = start_voxel[1] - i
-
-        voxel_idx = (start_voxel[0], idx_y, start_voxel[2])
-        in_plane_coords = voxel_coords[:, idx_y, :]
-        center_coords = voxel_coords[voxel_idx]
-        diff_to_center = in_plane_coords - center_coords
-        dist_to_voxel = np.linalg.norm(diff_to_center, axis=-1)
-        in_strut = dist_to_voxel <= radius
-        idxs_to_mask_x, idxs_to_mask_z = np.where(in_strut)
-        idxs_to_mask_y = np.ones_like(idxs_to_mask_x) * idx_y
-        voxel_cube.value_array[idxs_to_mask_x, idxs_to_mask_y, idxs_to_mask_z] = 1
+    stamp_cylinder_y(voxel_cube, start_voxel, radii, 1)
 
     return strut_start + [0, -n_voxels * voxel_cube.spacing[1], 0]
 
 
 def mark_rectangle(voxel_cube: VoxelCube, rect_start: np.ndarray):
-    voxel_coords = voxel_cube.voxel_coords
-
-    dist_to_start = np.linalg.norm(voxel_coords - rect_start, axis=-1)
-    start_voxel = np.argmin(dist_to_start)
-    start_voxel = np.unravel_index(start_voxel, dist_to_start.shape)
+    start_voxel = world_to_index(voxel_cube, rect_start)
 
     n_voxels_y = 3.5 / voxel_cube.spacing[1]
     n_voxels_x = 3.25 / voxel_cube.spacing[0]
@@ -228,29 +228,12 @@ def mark_rectangle(voxel_cube: VoxelCube, rect_start: np.ndarray):
 
     for i in range(int(n_voxels_y)):
         idx_y = start_voxel[1] - i
-        voxel_idx = (start_voxel[0], idx_y, start_voxel[2])
-        dist_to_voxel = np.linalg.norm(
-            voxel_coords[:, idx_y, :] - voxel_coords[voxel_idx], axis=-1
-        )
-        zero_out = dist_to_voxel <= 5
-        idxs_to_mask_x, idxs_to_mask_z = np.where(zero_out)
-        idxs_to_mask_y = np.ones_like(idxs_to_mask_x) * idx_y
-        voxel_cube.value_array[idxs_to_mask_x, idxs_to_mask_y, idxs_to_mask_z] = 0
+        stamp_disk_xz(voxel_cube, (start_voxel[0], start_voxel[2]), idx_y, 5, 0)
 
         for k, j in enumerate(x_voxelrange):
             idx_x = start_voxel[0] + j
             z_dist = z_distances[k]
-            voxel_idx = (idx_x, idx_y, start_voxel[2])
-
-            dist_to_voxel = np.linalg.norm(
-                voxel_coords[idx_x, idx_y, :] - voxel_coords[voxel_idx], axis=-1
-            )
-
-            in_strut = dist_to_voxel <= z_dist
-            idxs_to_mask_z = np.where(in_strut)
-            idxs_to_mask_x = np.ones_like(idxs_to_mask_z) * idx_x
-            idxs_to_mask_y = np.ones_like(idxs_to_mask_z) * idx_y
-            voxel_cube.value_array[idxs_to_mask_x, idxs_to_mask_y, idxs_to_mask_z] = 1
+            stamp_line_z(voxel_cube, (idx_x, start_voxel[2]), idx_y, z_dist, 1)
 
     return rect_start + [0, -n_voxels_y * voxel_cube.spacing[1], 0]
 
@@ -258,11 +241,7 @@ def mark_rectangle(voxel_cube: VoxelCube, rect_start: np.ndarray):
 def mark_second_cylinder(
     voxel_cube: VoxelCube, strut_start: np.ndarray, strut_end: np.ndarray
 ):
-    voxel_coords = voxel_cube.voxel_coords
-
-    dist_to_start = np.linalg.norm(voxel_coords - strut_start, axis=-1)
-    start_voxel = np.argmin(dist_to_start)
-    start_voxel = np.unravel_index(start_voxel, dist_to_start.shape)
+    start_voxel = world_to_index(voxel_cube, strut_start)
 
     n_voxels = abs(strut_start[1] - strut_end[1]) / voxel_cube.spacing[1]
     n_voxels = int(n_voxels)
@@ -271,19 +250,7 @@ def mark_second_cylinder(
     radii[:4] = radii_phase
     radii[-4:] = np.flip(radii_phase)
 
-    for i in range(n_voxels):
-        radius = radii[i]
-        idx_y = start_voxel[1] - i
-
-        voxel_idx = (start_voxel[0], idx_y, start_voxel[2])
-
-        dist_to_voxel = np.linalg.norm(
-            voxel_coords[:, idx_y, :] - voxel_coords[voxel_idx], axis=-1
-        )
-        in_strut = dist_to_voxel <= radius
-        idxs_to_mask_x, idxs_to_mask_z = np.where(in_strut)
-        idxs_to_mask_y = np.ones_like(idxs_to_mask_x) * idx_y
-        voxel_cube.value_array[idxs_to_mask_x, idxs_to_mask_y, idxs_to_mask_z] = 1
+    stamp_cylinder_y(voxel_cube, start_voxel, radii, 1)
 
 
 def get_insertion_voxel_cube(
@@ -333,7 +300,7 @@ def get_insertion_voxel_cube(
 
     curve_extension = extend_branch_end(curve, "end", 4)
 
-    voxel_cube = create_empty_voxel_cube_from_branches(
+    layers = VoxelLayers(
         [
             aorta_extension,
             aorta_extension_clear,
@@ -342,14 +309,11 @@ def get_insertion_voxel_cube(
             curve_extension,
         ],
         spacing,
+        PADDING_LOW,
+        PADDING_HIGH,
     )
-
-    for _ in range(50):
-        voxel_cube.add_padding_layer("y", dimension_end="high")
-    for _ in range(20):
-        voxel_cube.add_padding_layer_all_sides()
-
-    voxel_cube_struts = deepcopy(voxel_cube)
+    voxel_cube = layers["insertion"]
+    voxel_cube_struts = layers["struts"]
 
     start_rectangles = []
     for strut in struts:
@@ -367,9 +331,7 @@ def get_insertion_voxel_cube(
 
         mark_second_cylinder(voxel_cube_struts, start_sec_cyl, strut_end)
 
-    voxel_cube_struts.gaussian_smooth(1)
-    voxel_cube_struts.gaussian_smooth(0.4)
-    # voxel_cube_struts.gaussian_smooth(0.4)
+    gaussian_smooth(voxel_cube_struts, STRUT_SMOOTHING)
 
     for start_rectangle in start_rectangles:
         mark_rectangle(voxel_cube_struts, start_rectangle)
@@ -413,16 +375,9 @@ def get_insertion_voxel_cube(
         marking_value=0,
         radius_padding=2,
     )
-    voxel_cube.gaussian_smooth(1)
-    voxel_cube.gaussian_smooth(1)
-    voxel_cube.gaussian_smooth(1)
-
-    voxel_cube.gaussian_smooth(1)
-    voxel_cube.gaussian_smooth(0.7)
+    gaussian_smooth(voxel_cube, SMOOTHING)
 
-    voxel_cube.value_array = np.add(
-        voxel_cube.value_array, voxel_cube_struts.value_array
-    )
+    voxel_cube = layers.combine(["insertion", "struts"])
     return voxel_cube
 
 
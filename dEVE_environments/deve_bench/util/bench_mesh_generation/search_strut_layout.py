@@ -0,0 +1,143 @@
+import os
+import json
+import argparse
+from itertools import chain, combinations
+from math import comb
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
+import eve.intervention.vesseltree
+
+from eve.intervention.vesseltree.vesseltree import VesselTree
+from get_strut_position import (
+    GRID_SPACING,
+    get_strut_clearance,
+    get_vessel_xz,
+    grid_to_xz,
+)
+
+
+def score_strut_triples(
+    points_xz: np.ndarray,
+    clearance: np.ndarray,
+    vessel_center_xz: np.ndarray,
+    min_clearance: float = 0.5,
+    min_strut_distance: float = 2 * GRID_SPACING,
+    support_weight: float = 10.0,
+    chunk_size: int = 100000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # clearance, spread and stability of every triple of candidate points,
+    # higher score is better and -inf marks invalid triples
+    candidates = np.flatnonzero(clearance >= min_clearance)
+    n_triples = comb(candidates.size, 3)
+    triples = np.fromiter(
+        chain.from_iterable(combinations(candidates, 3)),
+        dtype=np.int64,
+        count=3 * n_triples,
+    ).reshape(-1, 3)
+    scores = np.empty(triples.shape[0])
+
+    for start in range(0, triples.shape[0], chunk_size):
+        chunk = triples[start : start + chunk_size]
+        a, b, c = (points_xz[chunk[:, k]] for k in range(3))
+
+        ab, ac, bc = b - a, c - a, c - b
+        cross = ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]
+        area = 0.5 * np.abs(cross)
+        min_dist = np.min(
+            np.linalg.norm(np.stack([ab, ac, bc], axis=1), axis=-1), axis=1
+        )
+
+        # vessel center inside the triangle keeps the phantom from tipping over
+        ap = vessel_center_xz - a
+        bp = vessel_center_xz - b
+        d1 = ab[:, 0] * ap[:, 1] - ab[:, 1] * ap[:, 0]
+        d2 = bc[:, 0] * bp[:, 1] - bc[:, 1] * bp[:, 0]
+        d3 = -(ac[:, 0] * ap[:, 1] - ac[:, 1] * ap[:, 0])
+        inside = ((d1 >= 0) & (d2 >= 0) & (d3 >= 0)) | (
+            (d1 <= 0) & (d2 <= 0) & (d3 <= 0)
+        )
+
+        # small clearance means the strut ends right below the vessel it supports
+        support = np.mean(clearance[chunk], axis=1)
+        score = np.sqrt(area) - support_weight * support
+        score[~inside | (min_dist < min_strut_distance)] = -np.inf
+        scores[start : start + chunk_size] = score
+    return triples, scores
+
+
+def search_strut_layout(
+    vesseltree: VesselTree,
+    grid_offset: Tuple[float, float] = [0.0, 0.0],
+    min_clearance: float = 0.5,
+    min_strut_distance: float = 2 * GRID_SPACING,
+) -> Optional[dict]:
+    grid_i, grid_j, clearance = get_strut_clearance(vesseltree, grid_offset)
+    grid_i, grid_j, clearance = grid_i.ravel(), grid_j.ravel(), clearance.ravel()
+    points_xz = grid_to_xz(grid_i, grid_j, grid_offset)
+    vessel_xz, _ = get_vessel_xz(vesseltree)
+
+    triples, scores = score_strut_triples(
+        points_xz,
+        clearance,
+        vessel_xz.mean(axis=0),
+        min_clearance,
+        min_strut_distance,
+    )
+    if not scores.size or not np.isfinite(scores.max()):
+        return None
+    best = triples[np.argmax(scores)]
+    return {
+        "struts": [[int(grid_i[idx]), int(grid_j[idx])] for idx in best],
+        "grid_offset": list(grid_offset),
+        "score": float(scores.max()),
+        "clearance": [float(clearance[idx]) for idx in best],
+    }
+
+
+def search_arch(arch_kwargs: dict, grid_offset: Tuple[float, float]) -> dict:
+    vessel_tree = eve.intervention.vesseltree.AorticArch(**arch_kwargs)
+    vessel_tree.reset()
+    result = search_strut_layout(vessel_tree, grid_offset)
+    return {"arch": arch_kwargs, "layout": result}
+
+
+def search_arches(
+    arch_kwargs: List[dict],
+    grid_offset: Tuple[float, float] = [0.0, 0.0],
+    n_workers: Optional[int] = None,
+) -> List[dict]:
+    n_workers = n_workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(
+            executor.map(search_arch, arch_kwargs, [grid_offset] * len(arch_kwargs))
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search strut layouts for arches")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[661023725])
+    parser.add_argument("--grid-offset", type=float, nargs=2, default=[0.0, 0.0])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    arches = [
+        {
+            "seed": seed,
+            "rotation_yzx_deg": [0, -25, 0],
+            "scaling_xyzd": [
+                0.7526567834727076,
+                0.7526567834727076,
+                0.7254665311210199,
+                0.85,
+            ],
+        }
+        for seed in args.seeds
+    ]
+    results = search_arches(arches, args.grid_offset, args.workers)
+    for result in results:
+        print(result["arch"]["seed"], result["layout"])
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,70 @@
+from typing import Optional, Tuple
+import numpy as np
+import pyvista as pv
+from eve.intervention.vesseltree.util.meshing import get_surface_mesh
+from eve.intervention.vesseltree.util.voxelcube import VoxelCube
+
+
+def get_split_ranges(
+    voxel_cube: VoxelCube,
+    z_split: float,
+    z_remove_lower: Optional[float] = None,
+    z_remove_upper: Optional[float] = None,
+) -> Tuple[Tuple[Optional[int], int], Tuple[int, Optional[int]]]:
+    spacing_z = voxel_cube.spacing[2]
+    z_split_idx = int(z_split / spacing_z)
+    z_remove_lower_idx = None
+    if z_remove_lower is not None:
+        z_remove_lower_idx = int(z_remove_lower / spacing_z)
+    z_remove_upper_idx = None
+    if z_remove_upper is not None:
+        z_remove_upper_idx = int(z_remove_upper / spacing_z)
+    return (z_remove_lower_idx, z_split_idx), (z_split_idx, z_remove_upper_idx)
+
+
+def get_slab_surface_mesh(
+    voxel_cube: VoxelCube,
+    *mesh_args,
+    z_low: Optional[int] = None,
+    z_high: Optional[int] = None,
+    chunk_size: int = 64,
+    decimation: Optional[float] = None,
+    **mesh_kwargs,
+) -> pv.PolyData:
+    # surface of the voxels in [z_low, z_high), as if all voxels outside were 0.
+    # the cube is meshed in z slabs that share one plane with the next slab,
+    # so their open seams match and are welded when stitching
+    value_array = voxel_cube.value_array
+    n_z = value_array.shape[2]
+    z_low = 0 if z_low is None else max(z_low, 0)
+    z_high = n_z if z_high is None else min(z_high, n_z)
+    # one zero plane on each side closes the surface at the cut
+    plane_low = max(z_low - 1, 0)
+    plane_high = min(z_high, n_z - 1)
+
+    pieces = []
+    for p_start in range(plane_low, plane_high, chunk_size):
+        p_end = min(p_start + chunk_size, plane_high)
+        slab = value_array[:, :, p_start : p_end + 1]
+        if p_start < z_low or p_end >= z_high:
+            slab = slab.copy()
+            slab[:, :, : max(z_low - p_start, 0)] = 0
+            slab[:, :, max(z_high - p_start, 0) :] = 0
+        if not np.any(slab):
+            continue
+
+        world_offset = np.array(voxel_cube.world_offset, dtype=np.float64)
+        world_offset[2] += p_start * voxel_cube.spacing[2]
+        piece = get_surface_mesh(
+            VoxelCube(slab, voxel_cube.spacing, world_offset), *mesh_args, **mesh_kwargs
+        )
+        if decimation is not None and piece.n_points:
+            piece = piece.decimate_pro(
+                decimation, preserve_topology=True, boundary_vertex_deletion=False
+            )
+        pieces.append(piece)
+
+    if not pieces:
+        return pv.PolyData()
+    mesh = pv.merge(pieces, merge_points=False)
+    return mesh.clean(tolerance=1e-3 * float(np.min(voxel_cube.spacing)))
@@ -0,0 +1,12 @@
+from vmr_phantom import make_printable_vmr
+
+if __name__ == "__main__":
+    make_printable_vmr(
+        "0166_0001",
+        rot_z=180,
+        rot_x=0,
+        z_split=None,
+        z_remove_lower=None,
+        z_remove_upper=None,
+        insertion_vessel_name="lva",
+    )
@@ -0,0 +1,312 @@
+import os
+import argparse
+from time import perf_counter
+from typing import List, Tuple
+import numpy as np
+import pyvista as pv
+from scipy.ndimage import binary_dilation, binary_erosion, generate_binary_structure
+
+from pykdtree.kdtree import KDTree  # pylint: disable=no-name-in-module
+import eve
+from eve.intervention.vesseltree.util.voxelcube import (
+    create_voxel_cube_from_mesh,
+    VoxelCube,
+)
+from eve.intervention.vesseltree.util.branch import Branch, BranchWithRadii
+from smoothing import gaussian_smooth
+from slabmesh import get_slab_surface_mesh, get_split_ranges
+from meshcache import MeshCache, get_params_key
+
+VOXEL_CACHE_NAME = "vmr_voxel_cache"
+SPACING = [0.2, 0.2, 0.2]
+N_PADDING = 12
+WALL_THICKNESS = 1.5
+EXTENSION_LENGTH = 6
+EXTENSION_DIAMETER = 5
+EXTENSION_CLEAR_RADII = [5, 1.5]
+SMOOTHING = [1, 1, 1]
+DECIMATION = 0.9
+
+
+def get_vmr(
+    model_id: str,
+    rot_z: float = 0.0,
+    rot_x: float = 0.0,
+    insertion_vessel_name: str = "lva",
+) -> eve.intervention.vesseltree.VMR:
+    vmr = eve.intervention.vesseltree.VMR(
+        model_id,
+        insertion_vessel_name=insertion_vessel_name,
+        insertion_point_idx=-1,
+        insertion_direction_idx_diff=-2,
+        approx_branch_radii=5,
+        rotate_yzx_deg=[0, rot_z, rot_x],
+    )
+    vmr.reset()
+    return vmr
+
+
+def load_vmr_mesh(
+    mesh_file: str, rot_z: float = 0.0, rot_x: float = 0.0
+) -> pv.UnstructuredGrid:
+    mesh = pv.read(mesh_file)
+    mesh.scale([10, 10, 10], inplace=True)
+    mesh.rotate_z(rot_z, inplace=True)
+    mesh.rotate_x(rot_x, inplace=True)
+    return mesh
+
+
+def get_vmr_voxel_cube(
+    mesh_file: str,
+    rot_z: float = 0.0,
+    rot_x: float = 0.0,
+    spacing: List[float] = SPACING,
+    n_padding: int = N_PADDING,
+    cache_dir: str = None,
+) -> Tuple[VoxelCube, np.ndarray]:
+    # voxelization and mesh points of the rotated model, cached on disk as they
+    # do not depend on the wall or extension settings
+    mesh_stat = os.stat(mesh_file)
+    key = get_params_key(
+        {
+            "mesh_file": os.path.abspath(mesh_file),
+            "mesh_size": mesh_stat.st_size,
+            "mesh_mtime": mesh_stat.st_mtime_ns,
+            "rot_z": rot_z,
+            "rot_x": rot_x,
+            "spacing": spacing,
+            "n_padding": n_padding,
+        }
+    )
+    cache_file = None
+    if cache_dir is not None:
+        model_name = os.path.splitext(os.path.basename(mesh_file))[0]
+        cache_file = os.path.join(cache_dir, f"{model_name}_{key[:16]}.npz")
+        if os.path.exists(cache_file):
+            with np.load(cache_file) as data:
+                cube = VoxelCube(
+                    data["value_array"], data["spacing"], data["world_offset"]
+                )
+                return cube, data["points"]
+
+    mesh = load_vmr_mesh(mesh_file, rot_z, rot_x)
+    cube = create_voxel_cube_from_mesh(mesh, spacing)
+    cube.add_padding_layer_all_sides(n_layers=n_padding)
+    points = np.asarray(mesh.points, dtype=np.float32)
+
+    if cache_file is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = f"{cache_file[:-4]}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_file,
+            value_array=cube.value_array,
+            spacing=np.asarray(cube.spacing),
+            world_offset=np.asarray(cube.world_offset),
+            points=points,
+        )
+        os.replace(tmp_file, cache_file)
+    return cube, points
+
+
+def get_wall_array(
+    cube: VoxelCube,
+    points: np.ndarray,
+    thickness: float = WALL_THICKNESS,
+    chunk_size: int = 1 << 20,
+) -> np.ndarray:
+    # voxels outside the vessel closer than thickness to the mesh points are 1.
+    # only a narrow band around the surface of the inside mask can be closer,
+    # so only the band is queried, in chunks with float32 voxel coordinates
+    inside = cube.value_array > 0.5
+    surface = inside ^ binary_erosion(inside)
+    n_band = int(np.ceil(thickness / np.min(cube.spacing))) + 1
+    band = binary_dilation(
+        surface, structure=generate_binary_structure(3, 3), iterations=n_band
+    )
+    band_idxs = np.flatnonzero(band)
+    del surface, band
+
+    tree = KDTree(np.asarray(points, dtype=np.float32))
+    spacing = np.asarray(cube.spacing, dtype=np.float32)
+    world_offset = np.asarray(cube.world_offset, dtype=np.float32)
+    wall = np.zeros(inside.shape, dtype=np.float32)
+    for start in range(0, band_idxs.size, chunk_size):
+        idxs = band_idxs[start : start + chunk_size]
+        voxel_idxs = np.stack(np.unravel_index(idxs, inside.shape), axis=-1)
+        coords = voxel_idxs.astype(np.float32) * spacing + world_offset
+        dist_to_mesh, _ = tree.query(coords, distance_upper_bound=thickness)
+        wall.flat[idxs] = (dist_to_mesh < thickness) & ~inside.flat[idxs]
+    return wall
+
+
+def extend_branch_end(branch: Branch, start_end: str, length: int, radius: float):
+    if start_end == "start":
+        coord_idx = 0
+        direction_idx = 1
+    else:
+        coord_idx = -1
+        direction_idx = -2
+    coord_start = branch.coordinates[coord_idx]
+    direction = branch.coordinates[coord_idx] - branch.coordinates[direction_idx]
+    direction = direction / np.linalg.norm(direction)
+    coord_end = coord_start + length * direction
+
+    new_points = np.linspace(
+        coord_end, coord_start, num=int(np.ceil(length)), endpoint=False
+    )
+    if not start_end == "start":
+        new_points = np.flip(new_points, axis=0)
+
+    n_points = new_points.shape[0]
+
+    new_radii = np.ones([n_points]) * radius
+
+    return BranchWithRadii(branch.name, new_points, new_radii)
+
+
+def make_printable_vmr(
+    model_id: str,
+    rot_z: float = 0.0,
+    rot_x: float = 0.0,
+    z_split: float = None,
+    z_remove_lower: float = None,
+    z_remove_upper: float = None,
+    insertion_vessel_name: str = "lva",
+    spacing: List[float] = SPACING,
+    wall_thickness: float = WALL_THICKNESS,
+    extension_length: float = EXTENSION_LENGTH,
+    extension_clear_radii: Tuple[float, float] = EXTENSION_CLEAR_RADII,
+    smoothing: List[float] = SMOOTHING,
+    decimation: float = DECIMATION,
+    output_dir: str = None,
+    cache_dir: str = None,
+):
+    dir_path = output_dir or os.path.dirname(os.path.realpath(__file__))
+    cache_dir = cache_dir or os.path.join(dir_path, VOXEL_CACHE_NAME)
+    mesh_cache = MeshCache(dir_path)
+    params = {
+        "script": "vmr_phantom",
+        "model_id": model_id,
+        "rot_z": rot_z,
+        "rot_x": rot_x,
+        "insertion_vessel_name": insertion_vessel_name,
+        "spacing": spacing,
+        "n_padding": N_PADDING,
+        "wall_thickness": wall_thickness,
+        "extension_length": extension_length,
+        "extension_clear_radii": extension_clear_radii,
+        "smoothing": smoothing,
+        "decimation": decimation,
+    }
+    split_params = {
+        **params,
+        "z_split": z_split,
+        "z_remove_lower": z_remove_lower,
+        "z_remove_upper": z_remove_upper,
+    }
+    name = f"vmr_{model_id}"
+    artifacts = {f"{name}_full": params}
+    if z_split is not None:
+        artifacts[f"{name}_lower"] = split_params
+        artifacts[f"{name}_upper"] = split_params
+    paths = {
+        artifact: mesh_cache.get(artifact, artifacts[artifact])
+        for artifact in artifacts
+    }
+    if all(paths.values()):
+        return paths
+
+    arch = get_vmr(model_id, rot_z, rot_x, insertion_vessel_name)
+
+    start = perf_counter()
+    mesh_file = os.path.join(arch.mesh_folder, model_id) + ".vtu"
+    cube, points = get_vmr_voxel_cube(
+        mesh_file, rot_z, rot_x, spacing, N_PADDING, cache_dir
+    )
+    wall = get_wall_array(cube, points, wall_thickness)
+    wall_model = VoxelCube(wall, cube.spacing, cube.world_offset)
+    print(f"time: {perf_counter()-start}")
+
+    end_extensions = []
+    for branch in arch:
+        start = branch.coordinates[0]
+        if arch.at_tree_end(start):
+            new_branch = extend_branch_end(
+                branch, "start", extension_length, EXTENSION_DIAMETER / 2
+            )
+            end_extensions.append(new_branch)
+
+        end = branch.coordinates[-1]
+        if arch.at_tree_end(end):
+            new_branch = extend_branch_end(
+                branch, "end", extension_length, EXTENSION_DIAMETER / 2
+            )
+            end_extensions.append(new_branch)
+
+    for branch in end_extensions:
+        radius = (
+            extension_clear_radii[0]
+            if branch.name == "aorta"
+            else extension_clear_radii[1]
+        )
+        wall_model.mark_centerline_in_array(
+            branch.coordinates, marking_value=0, cl_radii=radius
+        )
+
+    gaussian_smooth(wall_model, smoothing)
+
+    mesh = get_slab_surface_mesh(wall_model, "ascent", decimation=decimation)
+    paths[f"{name}_full"] = mesh_cache.put(f"{name}_full", params, mesh)
+    if z_split is not None:
+        (lower_low, lower_high), (upper_low, upper_high) = get_split_ranges(
+            wall_model, z_split, z_remove_lower, z_remove_upper
+        )
+        mesh = get_slab_surface_mesh(
+            wall_model,
+            "ascent",
+            z_low=lower_low,
+            z_high=lower_high,
+            decimation=decimation,
+        )
+        paths[f"{name}_lower"] = mesh_cache.put(f"{name}_lower", split_params, mesh)
+
+        mesh = get_slab_surface_mesh(
+            wall_model,
+            "ascent",
+            z_low=upper_low,
+            z_high=upper_high,
+            decimation=decimation,
+        )
+        paths[f"{name}_upper"] = mesh_cache.put(f"{name}_upper", split_params, mesh)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Printable phantom of a VMR model")
+    parser.add_argument("model_id")
+    parser.add_argument("--rot-z", type=float, default=0.0)
+    parser.add_argument("--rot-x", type=float, default=0.0)
+    parser.add_argument("--z-split", type=float, default=None)
+    parser.add_argument("--z-remove-lower", type=float, default=None)
+    parser.add_argument("--z-remove-upper", type=float, default=None)
+    parser.add_argument("--insertion-vessel", default="lva")
+    parser.add_argument("--wall-thickness", type=float, default=WALL_THICKNESS)
+    parser.add_argument("--extension-length", type=float, default=EXTENSION_LENGTH)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+
+    for artifact, path in make_printable_vmr(
+        args.model_id,
+        args.rot_z,
+        args.rot_x,
+        args.z_split,
+        args.z_remove_lower,
+        args.z_remove_upper,
+        insertion_vessel_name=args.insertion_vessel,
+        wall_thickness=args.wall_thickness,
+        extension_length=args.extension_length,
+        output_dir=args.output,
+        cache_dir=args.cache_dir,
+    ).items():
+        print(f"{artifact}: {path}")
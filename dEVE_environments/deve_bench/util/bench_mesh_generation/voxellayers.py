@@ -0,0 +1,58 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from eve.intervention.vesseltree.util.branch import Branch
+from eve.intervention.vesseltree.util.voxelcube import (
+    create_empty_voxel_cube_from_branches,
+    VoxelCube,
+)
+from eve.intervention.vesseltree.vesseltree import VesselTree
+
+
+class VoxelLayers:
+    def __init__(
+        self,
+        branches: Union[VesselTree, List[Branch]],
+        spacing: Tuple[float, float, float],
+        padding_low: Tuple[int, int, int] = [0, 0, 0],
+        padding_high: Tuple[int, int, int] = [0, 0, 0],
+    ) -> None:
+        # final padded extent is computed once, instead of growing the cube layer
+        # by layer with add_padding_layer
+        cube = create_empty_voxel_cube_from_branches(branches, spacing)
+        padding_low = np.asarray(padding_low, dtype=int)
+        padding_high = np.asarray(padding_high, dtype=int)
+        self.shape = tuple(
+            int(n)
+            for n in np.array(cube.value_array.shape) + padding_low + padding_high
+        )
+        self.spacing = cube.spacing
+        self.world_offset = np.asarray(cube.world_offset) - padding_low * np.asarray(
+            cube.spacing
+        )
+        self.dtype = cube.value_array.dtype
+        self.layers: Dict[str, VoxelCube] = {}
+
+    def __getitem__(self, name: str) -> VoxelCube:
+        # np.zeros maps untouched pages lazily, so a layer only takes memory
+        # where it is written to
+        if name not in self.layers:
+            self.layers[name] = VoxelCube(
+                np.zeros(self.shape, dtype=self.dtype),
+                self.spacing,
+                self.world_offset.copy(),
+            )
+        return self.layers[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.layers
+
+    def pop(self, name: str) -> VoxelCube:
+        return self.layers.pop(name)
+
+    def combine(self, names: List[str]) -> VoxelCube:
+        # sums the layers in place into the first one and releases the others
+        combined = self[names[0]]
+        for name in names[1:]:
+            layer = self.layers.pop(name)
+            np.add(combined.value_array, layer.value_array, out=combined.value_array)
+        return combined
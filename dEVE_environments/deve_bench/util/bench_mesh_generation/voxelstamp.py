@@ -0,0 +1,66 @@
+from typing import List, Tuple
+import numpy as np
+from eve.intervention.vesseltree.util.voxelcube import VoxelCube
+
+
+def world_to_index(voxel_cube: VoxelCube, coords: np.ndarray) -> Tuple[int, int, int]:
+    # nearest voxel center, voxel centers are at world_offset + idx * spacing
+    idx = np.round((np.asarray(coords) - voxel_cube.world_offset) / voxel_cube.spacing)
+    idx = np.clip(idx, 0, np.array(voxel_cube.value_array.shape) - 1)
+    return tuple(int(i) for i in idx)
+
+
+def _bounds(center: int, half_width: float, spacing: float, size: int):
+    n_voxels = int(np.ceil(half_width / spacing))
+    low = max(center - n_voxels, 0)
+    high = min(center + n_voxels + 1, size)
+    offsets = (np.arange(low, high) - center) * spacing
+    return low, high, offsets
+
+
+def stamp_disk_xz(
+    voxel_cube: VoxelCube,
+    center_idx: Tuple[int, int],
+    idx_y: int,
+    radius: float,
+    value: float,
+) -> None:
+    # disk around the voxel center_idx in the xz slice idx_y,
+    # only the bounding box of the disk is touched
+    if not 0 <= idx_y < voxel_cube.value_array.shape[1]:
+        return
+    shape = voxel_cube.value_array.shape
+    x_low, x_high, dx = _bounds(center_idx[0], radius, voxel_cube.spacing[0], shape[0])
+    z_low, z_high, dz = _bounds(center_idx[1], radius, voxel_cube.spacing[2], shape[2])
+    in_disk = dx[:, None] ** 2 + dz[None, :] ** 2 <= radius**2
+    voxel_cube.value_array[x_low:x_high, idx_y, z_low:z_high][in_disk] = value
+
+
+def stamp_line_z(
+    voxel_cube: VoxelCube,
+    center_idx: Tuple[int, int],
+    idx_y: int,
+    half_length: float,
+    value: float,
+) -> None:
+    shape = voxel_cube.value_array.shape
+    if not (0 <= idx_y < shape[1] and 0 <= center_idx[0] < shape[0]):
+        return
+    z_low, z_high, dz = _bounds(
+        center_idx[1], half_length, voxel_cube.spacing[2], shape[2]
+    )
+    z_idxs = np.arange(z_low, z_high)[np.abs(dz) <= half_length]
+    voxel_cube.value_array[center_idx[0], idx_y, z_idxs] = value
+
+
+def stamp_cylinder_y(
+    voxel_cube: VoxelCube,
+    start_idx: Tuple[int, int, int],
+    radii: List[float],
+    value: float,
+) -> None:
+    # one disk per slice, going from start_idx towards lower y
+    for i, radius in enumerate(radii):
+        stamp_disk_xz(
+            voxel_cube, (start_idx[0], start_idx[2]), start_idx[1] - i, radius, value
+        )
@@ -1,4 +0,0 @@
-from .archvariety import ArchVariety
-from .basicwirenav import BasicWireNav
-from .dualdevicenav import DualDeviceNav
-from .neurovascular2ins import Neurovascular2Ins
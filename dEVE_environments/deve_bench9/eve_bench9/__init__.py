@@ -1,3 +0,0 @@
-from .archvariety import ArchVariety
-from .basicwirenav import BasicWireNav
-from .dualdevicenav import DualDeviceNav